@@ -1,55 +1,469 @@
-import psutil
-import time
-import matplotlib.pyplot as plt
-
-def track_data_usage():
-    data_usage = []
-    timestamps = []
-
-    # Initial network stats
-    initial_stats = psutil.net_io_counters()
-    start_time = time.time()
-
-    while True:
-        # Current network stats
-        current_stats = psutil.net_io_counters()
-        elapsed_time = time.time() - start_time
-
-        # Calculate data usage since the last check
-        upload = current_stats.bytes_sent - initial_stats.bytes_sent
-        download = current_stats.bytes_recv - initial_stats.bytes_recv
-
-        # Append data usage and timestamp to the lists
-        data_usage.append((upload, download))
-        timestamps.append(elapsed_time)
-
-        # Update initial statistics for the next iteration
-        initial_stats = current_stats
-
-        # Check if the user wants to stop tracking
-        stop_tracking = input("Press 'q' to stop tracking or any other key to continue: ")
-        if stop_tracking.lower() == 'q':
-            break
-
-    # Generate a graph showing the data usage over time
-    plot_graph(timestamps, data_usage)
-
-
-def plot_graph(timestamps, data_usage):
-    uploads = [upload for upload, _ in data_usage]
-    downloads = [download for _, download in data_usage]
-
-    plt.plot(timestamps, uploads, label='Uploads')
-    plt.plot(timestamps, downloads, label='Downloads')
-
-    plt.xlabel('Time (seconds)')
-    plt.ylabel('Data Usage (bytes)')
-    plt.title('Data Usage During Online Session')
-    plt.legend()
-    plt.grid(True)
-    plt.show()
-
-# Start tracking data usage
-track_data_usage()
-
-#Psutil may not function correctly if user does not have access to network data
+import argparse
+import asyncio
+import threading
+import psutil
+import time
+from array import array
+import numpy as np
+import matplotlib.pyplot as plt
+
+from bandwidth_stats import StreamStats, parse_rate
+from bandwidth_store import BandwidthStoreReader, BandwidthStoreWriter
+
+
+class SampleRing:
+    # Fixed-capacity ring buffer of (elapsed, upload, download) samples.
+    # Storage is preallocated typed arrays, so memory stays constant however long the tracker runs.
+
+    def __init__(self, capacity=86400):
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.uploads = array('q', bytes(8 * capacity))
+        self.downloads = array('q', bytes(8 * capacity))
+        self.written = 0  # total samples ever written; also the sequence number of the next sample
+
+    def __len__(self):
+        return min(self.written, self.capacity)
+
+    def append(self, elapsed, upload, download):
+        slot = self.written % self.capacity
+        self.timestamps[slot] = elapsed
+        self.uploads[slot] = upload
+        self.downloads[slot] = download
+        self.written += 1
+
+    def since(self, sequence):
+        # Yield samples with sequence number >= sequence that are still held in the buffer
+        first = max(sequence, self.written - self.capacity)
+        for seq in range(first, self.written):
+            slot = seq % self.capacity
+            yield seq, self.timestamps[slot], self.uploads[slot], self.downloads[slot]
+
+    def snapshot(self):
+        # Oldest-to-newest copy of the buffer in the (timestamps, data_usage) shape plot_graph expects
+        timestamps = []
+        data_usage = []
+        for _, elapsed, upload, download in self.since(0):
+            timestamps.append(elapsed)
+            data_usage.append((upload, download))
+        return timestamps, data_usage
+
+    def arrays(self):
+        # Oldest-to-newest NumPy views of the buffer: (timestamps, data_usage as an n x 2 array)
+        count = len(self)
+        order = np.arange(self.written - count, self.written) % self.capacity
+        timestamps = np.frombuffer(self.timestamps, dtype=np.float64)[order]
+        data_usage = np.column_stack([np.frombuffer(self.uploads, dtype=np.int64)[order],
+                                      np.frombuffer(self.downloads, dtype=np.int64)[order]])
+        return timestamps, data_usage
+
+    def follow(self, poll_interval=0.05, stop_event=None):
+        # Generator that keeps yielding new samples as a sampler thread writes them
+        sequence = self.written
+        while True:
+            stopping = stop_event is not None and stop_event.is_set()
+            for sample in self.since(sequence):
+                sequence = sample[0] + 1
+                yield sample[1:]
+            if stopping:
+                break
+            time.sleep(poll_interval)
+
+
+def sample_data_usage(interval=1.0, ring=None, duration=None, stop_event=None):
+    # Non-interactive sampler: poll the counters every `interval` seconds on a monotonic clock,
+    # write each (elapsed, upload, download) sample into `ring` and yield it.
+    # Ticks are scheduled against absolute deadlines so the interval does not drift,
+    # and ticks missed while the process was stalled are skipped rather than bunched up.
+    initial_stats = psutil.net_io_counters()
+    start_time = time.monotonic()
+    next_tick = start_time + interval
+
+    while stop_event is None or not stop_event.is_set():
+        delay = next_tick - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        current_stats = psutil.net_io_counters()
+        now = time.monotonic()
+        elapsed_time = now - start_time
+
+        upload = current_stats.bytes_sent - initial_stats.bytes_sent
+        download = current_stats.bytes_recv - initial_stats.bytes_recv
+        initial_stats = current_stats
+
+        if ring is not None:
+            ring.append(elapsed_time, upload, download)
+        yield elapsed_time, upload, download
+
+        if duration is not None and elapsed_time >= duration:
+            break
+
+        next_tick += interval
+        if next_tick < now:
+            next_tick = now + interval - (now - next_tick) % interval
+
+
+class BackgroundSampler:
+    # Runs sample_data_usage on a daemon thread, filling a SampleRing that consumers read or follow.
+
+    def __init__(self, interval=1.0, capacity=86400, duration=None):
+        self.ring = SampleRing(capacity)
+        self.interval = interval
+        self.duration = duration
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        for _ in sample_data_usage(self.interval, self.ring, self.duration, self.stop_event):
+            pass
+        self.stop_event.set()
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def stream(self, poll_interval=None):
+        return self.ring.follow(poll_interval or self.interval, self.stop_event)
+
+
+def _rates(previous, current, dt):
+    # Per-key (sent, received) byte rates between two counter snapshots; counter resets read as zero
+    rates = {}
+    for key, (sent, received) in current.items():
+        if key in previous and dt > 0:
+            last_sent, last_received = previous[key]
+            rates[key] = (max(sent - last_sent, 0) / dt, max(received - last_received, 0) / dt)
+    return rates
+
+
+def _nic_counters():
+    return {nic: (stats.bytes_sent, stats.bytes_recv)
+            for nic, stats in psutil.net_io_counters(pernic=True).items()}
+
+
+def _process_counters():
+    # psutil has no per-process network counters. read_chars/write_chars (Linux) count all
+    # read/write syscalls including sockets; elsewhere fall back to disk read/write bytes.
+    counters = {}
+    for proc in psutil.process_iter(['name', 'io_counters']):
+        io = proc.info['io_counters']
+        if io is None:
+            continue
+        written = getattr(io, 'write_chars', io.write_bytes)
+        read = getattr(io, 'read_chars', io.read_bytes)
+        counters[(proc.pid, proc.info['name'])] = (written, read)
+    return counters
+
+
+class AsyncBandwidthCollector:
+    # Samples per-interface (and optionally per-process) counters concurrently on a fixed schedule
+    # and yields rates in bytes/s. Each tick's wall-clock overhead is recorded, and the per-process
+    # scan is abandoned for a tick if it would exceed `tick_budget` of the interval.
+
+    def __init__(self, interval=1.0, per_process=False, tick_budget=0.5):
+        self.interval = interval
+        self.per_process = per_process
+        self.tick_budget = tick_budget
+        self.ticks = 0
+        self.skipped_process_scans = 0
+        self.total_overhead = 0.0
+        self.max_overhead = 0.0
+        self._nic_previous = None
+        self._process_previous = None
+        self._process_scan = None
+
+    async def _collect(self, func):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func)
+
+    async def _collect_processes(self):
+        # A scan that overran its budget keeps running in its worker thread; never stack a second one
+        if self._process_scan is None or self._process_scan.done():
+            self._process_scan = asyncio.get_running_loop().run_in_executor(None, _process_counters)
+        return await asyncio.wait_for(asyncio.shield(self._process_scan), self.interval * self.tick_budget)
+
+    async def sample(self):
+        started = time.perf_counter()
+        jobs = [self._collect(_nic_counters)]
+        if self.per_process:
+            jobs.append(self._collect_processes())
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+        now = time.monotonic()
+
+        nic_counters = results[0]
+        if isinstance(nic_counters, BaseException):
+            raise nic_counters
+        nic_rates = {}
+        if self._nic_previous:
+            nic_rates = _rates(self._nic_previous[1], nic_counters, now - self._nic_previous[0])
+        self._nic_previous = (now, nic_counters)
+
+        process_rates = {}
+        if self.per_process:
+            process_counters = results[1]
+            if isinstance(process_counters, BaseException):
+                self.skipped_process_scans += 1
+            else:
+                if self._process_previous:
+                    process_rates = _rates(self._process_previous[1], process_counters,
+                                           now - self._process_previous[0])
+                self._process_previous = (now, process_counters)
+
+        overhead = time.perf_counter() - started
+        self.ticks += 1
+        self.total_overhead += overhead
+        self.max_overhead = max(self.max_overhead, overhead)
+        return {'time': now, 'nics': nic_rates, 'processes': process_rates, 'overhead': overhead}
+
+    async def run(self, duration=None):
+        # Async generator of samples; the first tick only primes the counters and is not yielded
+        start_time = time.monotonic()
+        next_tick = start_time
+        while duration is None or time.monotonic() - start_time < duration:
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            sample = await self.sample()
+            if self.ticks > 1:
+                sample['elapsed'] = sample['time'] - start_time
+                yield sample
+            next_tick += self.interval
+            if next_tick < time.monotonic():
+                next_tick = time.monotonic() + self.interval
+
+    def overhead_stats(self):
+        mean = self.total_overhead / self.ticks if self.ticks else 0.0
+        return {'ticks': self.ticks, 'mean_ms': mean * 1000, 'max_ms': self.max_overhead * 1000,
+                'skipped_process_scans': self.skipped_process_scans}
+
+
+async def _print_breakdown(interval, duration, per_process, top=5):
+    collector = AsyncBandwidthCollector(interval, per_process)
+    async for sample in collector.run(duration):
+        print(f"[{sample['elapsed']:8.2f}s]")
+        for nic, (sent, received) in sorted(sample['nics'].items()):
+            print(f"  {nic:<16} up {sent:>12,.0f} B/s  down {received:>12,.0f} B/s")
+        busiest = sorted(sample['processes'].items(), key=lambda item: -sum(item[1]))[:top]
+        for (pid, name), (written, read) in busiest:
+            print(f"  {name or '?':<16} [{pid}] write {written:>12,.0f} B/s  read {read:>12,.0f} B/s")
+    stats = collector.overhead_stats()
+    print(f"Tick overhead: mean {stats['mean_ms']:.2f} ms, max {stats['max_ms']:.2f} ms over {stats['ticks']} ticks")
+
+
+def track_data_usage(interval=None, duration=None, capacity=86400, plot=True, store=None,
+                     downsample='minmax', output=None, stats=None, status_every=None):
+    # With no interval, prompt after every sample as before.
+    # With an interval, sample unattended into a fixed-size ring buffer until duration elapses or Ctrl+C.
+    # `store` is a directory samples are also appended to (see bandwidth_store) so they outlive the run.
+    # `stats` is a bandwidth_stats.StreamStats fed every sample; its alerts are printed as they
+    # happen and, with `status_every`, a rolling summary every that many seconds.
+    if interval is not None:
+        ring = SampleRing(capacity)
+        writer = BandwidthStoreWriter(store) if store else None
+        epoch_start = time.time()
+        next_status = status_every
+        try:
+            for elapsed_time, upload, download in sample_data_usage(interval, ring, duration):
+                if writer is not None:
+                    writer.append(epoch_start + elapsed_time, upload, download)
+                if stats is not None:
+                    for alert in stats.update(elapsed_time, upload, download):
+                        print(f"ALERT [{alert.elapsed:8.1f}s] {alert.message}")
+                    if next_status is not None and elapsed_time >= next_status:
+                        print(stats.format_status())
+                        next_status += status_every
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if writer is not None:
+                writer.close()
+        if plot:
+            plot_graph(*ring.arrays(), downsample=downsample, output=output)
+        return ring
+
+    data_usage = []
+    timestamps = []
+
+    # Initial network stats
+    initial_stats = psutil.net_io_counters()
+    start_time = time.time()
+
+    while True:
+        # Current network stats
+        current_stats = psutil.net_io_counters()
+        elapsed_time = time.time() - start_time
+
+        # Calculate data usage since the last check
+        upload = current_stats.bytes_sent - initial_stats.bytes_sent
+        download = current_stats.bytes_recv - initial_stats.bytes_recv
+
+        # Append data usage and timestamp to the lists
+        data_usage.append((upload, download))
+        timestamps.append(elapsed_time)
+
+        # Update initial statistics for the next iteration
+        initial_stats = current_stats
+
+        # Check if the user wants to stop tracking
+        stop_tracking = input("Press 'q' to stop tracking or any other key to continue: ")
+        if stop_tracking.lower() == 'q':
+            break
+
+    # Generate a graph showing the data usage over time
+    if plot:
+        plot_graph(timestamps, data_usage, downsample, output)
+
+
+def minmax_downsample(x, y, buckets):
+    # Keep the minimum and maximum point of each of `buckets` equal-width index buckets, in time order.
+    # Peaks survive at any zoom level, and the work is a handful of vectorized passes.
+    n = len(y)
+    if n <= 2 * buckets:
+        return x, y
+    starts = np.unique(np.linspace(0, n, buckets + 1).astype(np.int64)[:-1])
+    counts = np.diff(np.append(starts, n))
+    bucket_of = np.repeat(np.arange(len(starts)), counts)
+
+    mins = np.minimum.reduceat(y, starts)
+    maxs = np.maximum.reduceat(y, starts)
+    is_min = y == mins[bucket_of]
+    is_max = y == maxs[bucket_of]
+    min_index = np.flatnonzero(is_min)[np.unique(bucket_of[is_min], return_index=True)[1]]
+    max_index = np.flatnonzero(is_max)[np.unique(bucket_of[is_max], return_index=True)[1]]
+
+    keep = np.unique(np.concatenate([min_index, max_index]))
+    return x[keep], y[keep]
+
+
+def lttb_downsample(x, y, points):
+    # Largest-Triangle-Three-Buckets: keep the point of each bucket that forms the largest triangle
+    # with the previously kept point and the next bucket's mean. The bucket walk is sequential by
+    # definition, so it loops once per output point while each bucket is scored in NumPy.
+    n = len(y)
+    if points >= n or points < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    keep = np.empty(points, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+
+    for bucket in range(points - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        next_lo, next_hi = hi, edges[bucket + 2] if bucket + 2 < len(edges) else n
+        mean_x = x[next_lo:next_hi].mean()
+        mean_y = y[next_lo:next_hi].mean()
+        ax, ay = x[keep[bucket]], y[keep[bucket]]
+        area = np.abs((ax - mean_x) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (mean_y - ay))
+        keep[bucket + 1] = lo + int(area.argmax())
+
+    return x[keep], y[keep]
+
+
+DOWNSAMPLERS = {
+    'minmax': lambda x, y, width: minmax_downsample(x, y, width // 2),
+    'lttb': lttb_downsample,
+    'none': lambda x, y, width: (x, y),
+}
+
+
+def plot_graph(timestamps, data_usage, downsample='minmax', output=None, title='Data Usage During Online Session'):
+    # Long captures are reduced to about one point per pixel of the figure before plotting.
+    # With `output` the graph is written to a PNG/SVG file on a non-interactive backend instead of shown.
+    if output:
+        plt.switch_backend('Agg')
+
+    timestamps = np.asarray(timestamps, dtype=float)
+    data_usage = np.asarray(data_usage, dtype=float).reshape(-1, 2)
+    figure = plt.figure()
+    width = int(figure.get_figwidth() * figure.dpi)
+    reduce = DOWNSAMPLERS[downsample]
+
+    plt.plot(*reduce(timestamps, data_usage[:, 0], width), label='Uploads')
+    plt.plot(*reduce(timestamps, data_usage[:, 1], width), label='Downloads')
+
+    plt.xlabel('Time (seconds)')
+    plt.ylabel('Data Usage (bytes)')
+    plt.title(title)
+    plt.legend()
+    plt.grid(True)
+    if output:
+        plt.savefig(output)
+        plt.close(figure)
+    else:
+        plt.show()
+
+
+def replay(store, start=None, end=None, downsample='minmax', output=None, max_points=20000):
+    # Re-plot a time window (epoch seconds) from a sample store. Wide windows are read from the
+    # 1s/1m/1h rollups so at most about max_points records are ever loaded.
+    records, resolution = BandwidthStoreReader(store).read_for_width(start, end, max_points)
+    if not len(records):
+        print("No samples in the requested window")
+        return
+    timestamps = records['timestamp'] - records['timestamp'][0]
+    data_usage = np.column_stack([records['upload'], records['download']])
+    title = 'Data Usage During Online Session'
+    if resolution:
+        title += f' ({resolution}s totals)'
+    plot_graph(timestamps, data_usage, downsample, output, title)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Track network data usage over time.")
+    parser.add_argument("--interval", type=float,
+                        help="Sample unattended every INTERVAL seconds (e.g. 0.01) instead of prompting")
+    parser.add_argument("--duration", type=float, help="Stop after DURATION seconds (default: until Ctrl+C)")
+    parser.add_argument("--capacity", type=int, default=86400, help="Samples kept in the ring buffer")
+    parser.add_argument("--no-plot", action="store_true", help="Do not show the graph when tracking stops")
+    parser.add_argument("--store", help="Also append unattended samples to this store directory")
+    parser.add_argument("--replay", metavar="STORE", help="Plot samples from a store directory instead of tracking")
+    parser.add_argument("--since", type=float, help="With --replay, only plot the last SINCE seconds")
+    parser.add_argument("--downsample", choices=sorted(DOWNSAMPLERS), default="minmax",
+                        help="How long captures are reduced to the figure width before plotting")
+    parser.add_argument("--output", help="Write the graph to this PNG/SVG file instead of showing it (headless)")
+    parser.add_argument("--per-nic", action="store_true",
+                        help="Print per-interface rates every interval instead of tracking totals")
+    parser.add_argument("--per-process", action="store_true",
+                        help="With --per-nic, also print the busiest processes by I/O rate")
+    parser.add_argument("--stats", action="store_true",
+                        help="With --interval, keep rolling rate statistics and print them periodically")
+    parser.add_argument("--status-every", type=float, default=10.0, help="Seconds between --stats summaries")
+    parser.add_argument("--halflife", type=float, default=10.0, help="Half-life (seconds) of the averaged rates")
+    parser.add_argument("--alert-upload", type=parse_rate, metavar="RATE",
+                        help="Alert when upload stays above RATE bytes/s (suffix K, M or G)")
+    parser.add_argument("--alert-download", type=parse_rate, metavar="RATE",
+                        help="Alert when download stays above RATE bytes/s (suffix K, M or G)")
+    parser.add_argument("--anomaly-z", type=float, default=4.0,
+                        help="Alert on rates this many standard deviations from the average (0 disables)")
+    args = parser.parse_args(argv)
+    args.stats = args.stats or args.alert_upload is not None or args.alert_download is not None
+    if args.stats and args.interval is None and not args.replay and not args.per_nic:
+        parser.error("--stats and the alert options need --interval")
+    return args
+
+
+if __name__ == "__main__":
+    # Start tracking data usage
+    args = parse_args()
+    if args.replay:
+        replay(args.replay, time.time() - args.since if args.since else None,
+               downsample=args.downsample, output=args.output)
+    elif args.per_nic:
+        asyncio.run(_print_breakdown(args.interval or 1.0, args.duration, args.per_process))
+    else:
+        stats = None
+        if args.stats:
+            stats = StreamStats(args.halflife, upload_limit=args.alert_upload,
+                                download_limit=args.alert_download, anomaly_z=args.anomaly_z)
+        track_data_usage(args.interval, args.duration, args.capacity, plot=not args.no_plot, store=args.store,
+                         downsample=args.downsample, output=args.output, stats=stats,
+                         status_every=args.status_every if stats else None)
+
+#Psutil may not function correctly if user does not have access to network data
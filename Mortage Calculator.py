@@ -1,51 +1,531 @@
-def calculate_mortgage(principal, interest_rate, years):
-    
-    # Calculate the monthly mortgage payment given the principal amount, annual interest rate, and loan term in years.
-    
-    monthly_interest_rate = interest_rate / 100 / 12
-    total_payments = years * 12
-
-    # Calculate the monthly mortgage payment
-    mortgage_payment = (principal * monthly_interest_rate) / (1 - (1 + monthly_interest_rate) ** -total_payments)
-
-    return mortgage_payment
-
-
-def mortgage_schedule(principal, interest_rate, years):
-    
-    # Generate a mortgage payment schedule showing the monthly payment, interest paid, principal paid, and remaining balance.
-    
-    monthly_payment = calculate_mortgage(principal, interest_rate, years)
-    remaining_balance = principal
-
-    print("Mortgage Payment Schedule:")
-    print("--------------------------")
-    print("Month\tPayment\tInterest\tPrincipal\tBalance")
-
-    month = 1
-    while month <= years * 12:
-        interest = remaining_balance * interest_rate / 100 / 12
-        principal_payment = monthly_payment - interest
-        remaining_balance -= principal_payment
-
-        #Print mortgage schedule to two decimals places
-        print(str(month) + "\t" + format(monthly_payment, ".2f") + "\t" + format(interest, ".2f") + "\t\t" + format(principal_payment, ".2f") + "\t\t" + format(remaining_balance, ".2f"))
-
-        month += 1
-
-
-# Example usage
-principal = 100000
-interest_rate = 10
-years = 25
-
-monthly_payment = calculate_mortgage(principal, interest_rate, years)
-total_payment = monthly_payment * years * 12
-
-print("Principal amount: $" + str(principal))
-print("Interest rate: " + str(interest_rate) + "%")
-print("Loan term: " + str(years) + " years")
-print("Monthly mortgage payment: $" + format(monthly_payment, ".2f"))
-print("Total payment: $" + format(total_payment, ".2f"))
-
-mortgage_schedule(principal, interest_rate, years)
+import argparse
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+# Column layout of the 2-D schedule table returned by amortization_table
+SCHEDULE_COLUMNS = ("loan", "month", "payment", "interest", "principal", "balance")
+
+# Grid axes and result columns written by sweep
+SWEEP_AXES = ("principal", "interest_rate", "years", "extra_payment", "points")
+SWEEP_COLUMNS = SWEEP_AXES + (
+    "monthly_payment", "payoff_month", "total_interest", "points_cost", "total_cost", "break_even_month",
+)
+
+
+def calculate_mortgage(principal, interest_rate, years):
+    
+    # Calculate the monthly mortgage payment given the principal amount, annual interest rate, and loan term in years.
+    
+    monthly_interest_rate = interest_rate / 100 / 12
+    total_payments = years * 12
+
+    # Calculate the monthly mortgage payment
+    mortgage_payment = (principal * monthly_interest_rate) / (1 - (1 + monthly_interest_rate) ** -total_payments)
+
+    return mortgage_payment
+
+
+def _loan_arrays(principals, interest_rates, years):
+
+    # Broadcast scalar or array loan parameters to three flat float arrays of equal length.
+
+    principals, interest_rates, years = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(principals, dtype=float)),
+        np.atleast_1d(np.asarray(interest_rates, dtype=float)),
+        np.atleast_1d(np.asarray(years, dtype=float)),
+    )
+    return principals.ravel(), interest_rates.ravel(), years.ravel()
+
+
+def calculate_mortgages(principals, interest_rates, years):
+
+    # Vectorised calculate_mortgage for arrays of loans. Zero-rate loans are repaid in equal instalments.
+
+    principals, interest_rates, years = _loan_arrays(principals, interest_rates, years)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payments = calculate_mortgage(principals, interest_rates, years)
+    zero_rate = interest_rates == 0
+    payments[zero_rate] = principals[zero_rate] / (years[zero_rate] * 12)
+    return payments
+
+
+def amortization_schedules(principals, interest_rates, years):
+
+    # Build payment, interest, principal and balance schedules for many loans in one shot.
+    # Returns four (loans x months) arrays; months past a loan's term are zero.
+    # Balances use the closed-form annuity balance B_k = P(1+r)^k - M((1+r)^k - 1)/r,
+    # so no Python-level loop over months is needed.
+
+    principals, interest_rates, years = _loan_arrays(principals, interest_rates, years)
+    payments = calculate_mortgages(principals, interest_rates, years)
+    monthly_rates = interest_rates / 100 / 12
+
+    # Same month count as the original "while month <= years * 12" loop
+    term_months = np.floor(years * 12 + 1e-9).astype(np.int64)
+    max_months = int(term_months.max()) if term_months.size else 0
+    months = np.arange(max_months + 1)
+
+    growth = (1 + monthly_rates[:, None]) ** months[None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(
+            monthly_rates[:, None] == 0,
+            months[None, :].astype(float),
+            (growth - 1) / monthly_rates[:, None],
+        )
+    balances = principals[:, None] * growth - payments[:, None] * annuity
+
+    interest = balances[:, :-1] * monthly_rates[:, None]
+    principal_paid = payments[:, None] - interest
+    balances = balances[:, 1:]
+    payment = np.broadcast_to(payments[:, None], interest.shape).copy()
+
+    active = months[None, 1:] <= term_months[:, None]
+    for schedule in (payment, interest, principal_paid, balances):
+        schedule[~active] = 0.0
+
+    return payment, interest, principal_paid, balances
+
+
+# Rates are held as integer millionths of a percent in the cents engine
+RATE_SCALE = 10 ** 6
+
+
+def amortization_schedules_cents(principals, interest_rates, years):
+
+    # Statement-exact schedules in int64 cents for many loans at once.
+    # The payment is rounded half-up to the cent, each month's interest is rounded half-up to the cent,
+    # and the final payment is adjusted so the balance ends at exactly zero.
+    # Rates are exact to a millionth of a percent. Balances times rates must stay below 2**62,
+    # e.g. balances up to $100M at rates up to 40%.
+    # Returns four (loans x months) int64 arrays; months past a loan's term are zero.
+
+    principals, interest_rates, years = _loan_arrays(principals, interest_rates, years)
+    balance = np.floor(principals * 100 + 0.5).astype(np.int64)
+    rate = np.floor(interest_rates * RATE_SCALE + 0.5).astype(np.int64)
+    denominator = 1200 * RATE_SCALE
+    level_payment = np.floor(calculate_mortgages(principals, interest_rates, years) * 100 + 0.5).astype(np.int64)
+
+    term_months = np.floor(years * 12 + 1e-9).astype(np.int64)
+    max_months = int(term_months.max()) if term_months.size else 0
+    payment = np.zeros((len(balance), max_months), dtype=np.int64)
+    interest = np.zeros_like(payment)
+    principal_paid = np.zeros_like(payment)
+    balances = np.zeros_like(payment)
+
+    for month in range(max_months):
+        active = month < term_months
+        month_interest = (balance * rate * 2 + denominator) // (2 * denominator)
+        due = balance + month_interest
+        month_payment = np.where(month == term_months - 1, due, np.minimum(level_payment, due))
+        month_payment = np.where(active, month_payment, 0)
+        month_interest = np.where(active, month_interest, 0)
+        balance = balance - (month_payment - month_interest)
+
+        payment[:, month] = month_payment
+        interest[:, month] = month_interest
+        principal_paid[:, month] = month_payment - month_interest
+        balances[:, month] = np.where(active, balance, 0)
+
+    return payment, interest, principal_paid, balances
+
+
+def amortization_table(principals, interest_rates, years, as_dataframe=False, cents=False):
+
+    # Flatten the schedules of many loans into one 2-D table with SCHEDULE_COLUMNS.
+    # Only months inside each loan's term are included. Set as_dataframe for a pandas DataFrame.
+    # With cents=True the amounts come from the cent-rounded engine (in dollars, exact to the cent).
+
+    if cents:
+        payment, interest, principal_paid, balances = (
+            schedule / 100 for schedule in amortization_schedules_cents(principals, interest_rates, years)
+        )
+    else:
+        payment, interest, principal_paid, balances = amortization_schedules(principals, interest_rates, years)
+    n_loans, max_months = payment.shape
+    loan_index = np.repeat(np.arange(n_loans), max_months)
+    month_index = np.tile(np.arange(1, max_months + 1), n_loans)
+
+    _, _, years = _loan_arrays(principals, interest_rates, years)
+    term_months = np.floor(years * 12 + 1e-9).astype(np.int64)
+    active = month_index <= np.repeat(term_months, max_months)
+
+    table = np.column_stack([
+        loan_index,
+        month_index,
+        payment.ravel(),
+        interest.ravel(),
+        principal_paid.ravel(),
+        balances.ravel(),
+    ])[active]
+
+    if as_dataframe:
+        import pandas as pd
+
+        frame = pd.DataFrame(table, columns=SCHEDULE_COLUMNS)
+        return frame.astype({"loan": np.int64, "month": np.int64})
+    return table
+
+
+@lru_cache(maxsize=4096)
+def _loan_terms(principal, interest_rate, years):
+
+    # Cached per-loan constants (monthly rate, payment, term in months) shared by the schedule queries.
+
+    monthly_interest_rate = interest_rate / 100 / 12
+    term_months = int(math.floor(years * 12 + 1e-9))
+    if monthly_interest_rate == 0:
+        payment = principal / (years * 12)
+    else:
+        payment = calculate_mortgage(principal, interest_rate, years)
+    return monthly_interest_rate, payment, term_months
+
+
+def _balance_after(principal, monthly_interest_rate, payment, month):
+
+    # Closed-form balance after a number of payments of a fixed amount.
+
+    if monthly_interest_rate == 0:
+        return principal - payment * month
+    growth = (1 + monthly_interest_rate) ** month
+    return principal * growth - payment * (growth - 1) / monthly_interest_rate
+
+
+def remaining_balance(principal, interest_rate, years, month):
+
+    # Balance left after the given month's payment, without generating the schedule.
+
+    monthly_interest_rate, payment, term_months = _loan_terms(principal, interest_rate, years)
+    month = min(max(int(month), 0), term_months)
+    return _balance_after(principal, monthly_interest_rate, payment, month)
+
+
+def cumulative_principal(principal, interest_rate, years, start_month, end_month):
+
+    # Principal repaid from start_month through end_month inclusive (months are 1-based).
+
+    return (remaining_balance(principal, interest_rate, years, start_month - 1)
+            - remaining_balance(principal, interest_rate, years, end_month))
+
+
+def cumulative_interest(principal, interest_rate, years, start_month, end_month):
+
+    # Interest paid from start_month through end_month inclusive, e.g. years 3-5 are months 25 to 60.
+
+    _, payment, term_months = _loan_terms(principal, interest_rate, years)
+    first = min(max(int(start_month), 1), term_months + 1)
+    last = min(max(int(end_month), first - 1), term_months)
+    paid = payment * (last - first + 1)
+    return paid - cumulative_principal(principal, interest_rate, years, first, last)
+
+
+def payoff_month(principal, interest_rate, years, extra_payment=0):
+
+    # Month in which the loan is paid off when extra_payment is added to every regular payment.
+
+    monthly_interest_rate, payment, term_months = _loan_terms(principal, interest_rate, years)
+    total_payment = payment + extra_payment
+    if total_payment <= 0:
+        raise ValueError("Payment must be positive")
+    if monthly_interest_rate == 0:
+        months = principal / total_payment
+    else:
+        # Solve B_n = 0 for n: (1 + r)^n = M / (M - P r)
+        months = math.log(total_payment / (total_payment - principal * monthly_interest_rate)) / math.log(1 + monthly_interest_rate)
+    return min(int(math.ceil(months - 1e-9)), term_months)
+
+
+def print_schedule(table, out=None):
+
+    # Render one loan's schedule table in the classic tab-separated console layout.
+
+    out = out or sys.stdout
+    lines = [
+        "Mortgage Payment Schedule:",
+        "--------------------------",
+        "Month\tPayment\tInterest\tPrincipal\tBalance",
+    ]
+    for _, month, payment, interest, principal_payment, balance in table:
+        #Print mortgage schedule to two decimals places
+        lines.append(str(int(month)) + "\t" + format(payment, ".2f") + "\t" + format(interest, ".2f") + "\t\t" + format(principal_payment, ".2f") + "\t\t" + format(balance, ".2f"))
+    out.write("\n".join(lines) + "\n")
+
+
+def mortgage_schedule(principal, interest_rate, years, show=True, cents=False):
+    
+    # Generate a mortgage payment schedule showing the monthly payment, interest paid, principal paid, and remaining balance.
+    # The schedule is returned as a 2-D table (see SCHEDULE_COLUMNS); printing it is optional.
+    # cents=True rounds every payment to the cent and adjusts the last payment, as on a statement.
+    
+    table = amortization_table(principal, interest_rate, years, cents=cents)
+    if show:
+        print_schedule(table)
+    return table
+
+
+def _loop_schedule(principal, interest_rate, years):
+
+    # Reference month-by-month loop, kept as the baseline for benchmark_schedules.
+
+    monthly_payment = calculate_mortgage(principal, interest_rate, years)
+    remaining_balance = principal
+    rows = []
+
+    month = 1
+    while month <= years * 12:
+        interest = remaining_balance * interest_rate / 100 / 12
+        principal_payment = monthly_payment - interest
+        remaining_balance -= principal_payment
+        rows.append((month, monthly_payment, interest, principal_payment, remaining_balance))
+        month += 1
+
+    return rows
+
+
+def benchmark_schedules(n_loans=20000, loop_sample=500, seed=0):
+
+    # Compare per-loan throughput of the vectorised engine against the month-by-month loop.
+
+    rng = np.random.default_rng(seed)
+    principals = rng.uniform(50000, 1000000, n_loans).round(-2)
+    interest_rates = rng.uniform(1, 12, n_loans).round(2)
+    years = rng.choice([10, 15, 20, 25, 30], n_loans)
+
+    start = time.perf_counter()
+    for i in range(loop_sample):
+        _loop_schedule(principals[i], interest_rates[i], years[i])
+    loop_rate = loop_sample / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    amortization_schedules(principals, interest_rates, years)
+    engine_rate = n_loans / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    amortization_schedules_cents(principals, interest_rates, years)
+    cents_rate = n_loans / (time.perf_counter() - start)
+
+    print("Loop:   " + format(loop_rate, ",.0f") + " loans/s (" + str(loop_sample) + " loans)")
+    print("Engine: " + format(engine_rate, ",.0f") + " loans/s (" + str(n_loans) + " loans)")
+    print("Speed-up: " + format(engine_rate / loop_rate, ".1f") + "x")
+    print("Cents engine: " + format(cents_rate, ",.0f") + " loans/s (" + format(engine_rate / cents_rate, ".2f") + "x the float engine's time)")
+    return {"loop_loans_per_s": loop_rate, "engine_loans_per_s": engine_rate, "cents_loans_per_s": cents_rate}
+
+
+def sweep_chunk(grid, start, stop, point_rate_reduction=0.25):
+
+    # Evaluate grid scenarios start..stop-1 (flat index into the product of the grid axes) in one vectorised pass.
+    # Each discount point costs 1% of the principal and lowers the rate by point_rate_reduction percentage points.
+    # Returns a dict of SWEEP_COLUMNS arrays.
+
+    index = np.unravel_index(np.arange(start, stop), [len(axis) for axis in grid])
+    principal, interest_rate, years, extra_payment, points = (
+        np.asarray(axis, dtype=float)[i] for axis, i in zip(grid, index)
+    )
+
+    effective_rate = np.maximum(interest_rate - points * point_rate_reduction, 0)
+    base_payment = calculate_mortgages(principal, interest_rate, years)
+    payment = calculate_mortgages(principal, effective_rate, years)
+    monthly_rate = effective_rate / 100 / 12
+    term_months = np.floor(years * 12 + 1e-9)
+    total_payment = payment + extra_payment
+
+    # Payoff month from B_n = 0 with the larger payment, capped at the original term
+    with np.errstate(divide="ignore", invalid="ignore"):
+        months = np.where(
+            monthly_rate == 0,
+            principal / total_payment,
+            np.log(total_payment / (total_payment - principal * monthly_rate)) / np.log1p(monthly_rate),
+        )
+    payoff = np.minimum(np.ceil(months - 1e-9), term_months)
+
+    # Everything paid = full payments before the last month + the final (partial) payment
+    growth = (1 + monthly_rate) ** (payoff - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(monthly_rate == 0, payoff - 1, (growth - 1) / monthly_rate)
+    balance_before_last = principal * growth - total_payment * annuity
+    total_paid = total_payment * (payoff - 1) + balance_before_last * (1 + monthly_rate)
+    total_interest = np.maximum(total_paid - principal, 0)
+
+    points_cost = principal * points / 100
+    savings = base_payment - payment
+    with np.errstate(divide="ignore", invalid="ignore"):
+        break_even = np.where(points > 0, np.ceil(points_cost / savings), 0)
+    break_even[(points > 0) & (savings <= 0)] = np.nan
+
+    return {
+        "principal": principal,
+        "interest_rate": interest_rate,
+        "years": years,
+        "extra_payment": extra_payment,
+        "points": points,
+        "monthly_payment": payment,
+        "payoff_month": payoff,
+        "total_interest": total_interest,
+        "points_cost": points_cost,
+        "total_cost": total_interest + points_cost,
+        "break_even_month": break_even,
+    }
+
+
+def _open_columns(output, size, mode):
+
+    # Memory-mapped .npy file per result column inside the output directory.
+
+    return {
+        name: np.lib.format.open_memmap(os.path.join(output, name + ".npy"), mode=mode, dtype=np.float64, shape=(size,))
+        for name in SWEEP_COLUMNS
+    }
+
+
+def _sweep_worker(job):
+
+    # Process pool worker: evaluate one chunk and write it straight into the shared column files.
+
+    grid, start, stop, point_rate_reduction, output, size = job
+    columns = _open_columns(output, size, "r+")
+    for name, values in sweep_chunk(grid, start, stop, point_rate_reduction).items():
+        columns[name][start:stop] = values
+        columns[name].flush()
+    return stop - start
+
+
+def _chunk_worker(job):
+
+    # Process pool worker for .parquet sweeps: evaluate one chunk and return its columns.
+
+    grid, start, stop, point_rate_reduction = job
+    return sweep_chunk(grid, start, stop, point_rate_reduction)
+
+
+def _evaluate_chunks(grid, bounds, point_rate_reduction, workers):
+
+    # Yield the evaluated chunks in grid order. With workers > 1 the chunks are evaluated on a process pool,
+    # keeping at most two chunks per worker in flight so memory stays bounded by the chunk size.
+
+    jobs = [(grid, start, stop, point_rate_reduction) for start, stop in bounds]
+    if workers == 1:
+        for job in jobs:
+            yield _chunk_worker(job)
+        return
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for job in jobs:
+            pending.append(pool.submit(_chunk_worker, job))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def sweep(principals, interest_rates, years, extra_payments=(0,), points=(0,), output="mortgage_sweep",
+          chunk_size=500000, workers=1, point_rate_reduction=0.25):
+
+    # Evaluate every combination of the given parameter values and write the results column by column.
+    # The grid is processed in chunks of chunk_size scenarios, so memory depends on the chunk size, not the grid size.
+    # output is either a directory of .npy columns (memory-mapped, readable with np.load(mmap_mode="r"))
+    # or a .parquet file (needs pyarrow). workers > 1 spreads the chunks over a process pool; Parquet
+    # row groups are still written by this process, in grid order.
+
+    grid = tuple(np.atleast_1d(np.asarray(axis, dtype=float)) for axis in
+                 (principals, interest_rates, years, extra_payments, points))
+    size = int(np.prod([len(axis) for axis in grid]))
+    bounds = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+    if output.endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for columns in _evaluate_chunks(grid, bounds, point_rate_reduction, workers):
+                chunk = pa.table(columns)
+                writer = writer or pq.ParquetWriter(output, chunk.schema)
+                writer.write_table(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        return size
+
+    os.makedirs(output, exist_ok=True)
+    _open_columns(output, size, "w+")  # create the column files before the workers write into them
+    jobs = [(grid, start, stop, point_rate_reduction, output, size) for start, stop in bounds]
+    if workers == 1:
+        for job in jobs:
+            _sweep_worker(job)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(_sweep_worker, jobs):
+                pass
+    return size
+
+
+def load_sweep(output):
+
+    # Read a .npy sweep directory back as memory-mapped columns.
+
+    return {name: np.load(os.path.join(output, name + ".npy"), mmap_mode="r") for name in SWEEP_COLUMNS}
+
+
+def parse_values(text):
+
+    # Parse "start:stop:step" (stop inclusive) or a comma separated list of values.
+
+    if ":" in text:
+        start, stop, step = (float(part) for part in text.split(":"))
+        return np.arange(start, stop + step / 2, step)
+    return np.array([float(part) for part in text.split(",")])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mortgage payment calculator, schedules and parameter sweeps.")
+    parser.add_argument("--benchmark", action="store_true", help="Compare the schedule engine with the month-by-month loop")
+    parser.add_argument("--cents", action="store_true", help="Print the example schedule rounded to the cent")
+    parser.add_argument("--sweep", metavar="OUTPUT",
+                        help="Run a parameter sweep into OUTPUT (a directory of .npy columns, or a .parquet file)")
+    parser.add_argument("--principal", type=parse_values, default="100000", help="Principals, e.g. 100000:500000:10000")
+    parser.add_argument("--rate", type=parse_values, default="10", help="Annual interest rates in percent, e.g. 3:8:0.125")
+    parser.add_argument("--years", type=parse_values, default="25", help="Loan terms in years, e.g. 15,20,30")
+    parser.add_argument("--extra", type=parse_values, default="0", help="Extra monthly payments")
+    parser.add_argument("--points", type=parse_values, default="0", help="Discount points bought at origination")
+    parser.add_argument("--point-reduction", type=float, default=0.25, help="Rate reduction per point (percentage points)")
+    parser.add_argument("--chunk-size", type=int, default=500000, help="Scenarios evaluated per chunk")
+    parser.add_argument("--workers", type=int, default=1, help="Processes used for the sweep")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.benchmark:
+        benchmark_schedules()
+        sys.exit()
+
+    if args.sweep:
+        start = time.perf_counter()
+        size = sweep(args.principal, args.rate, args.years, args.extra, args.points, args.sweep,
+                     args.chunk_size, args.workers, args.point_reduction)
+        elapsed = time.perf_counter() - start
+        print("Evaluated " + format(size, ",") + " scenarios in " + format(elapsed, ".2f") + "s -> " + args.sweep)
+        sys.exit()
+
+    # Example usage
+    principal = 100000
+    interest_rate = 10
+    years = 25
+
+    monthly_payment = calculate_mortgage(principal, interest_rate, years)
+    total_payment = monthly_payment * years * 12
+
+    print("Principal amount: $" + str(principal))
+    print("Interest rate: " + str(interest_rate) + "%")
+    print("Loan term: " + str(years) + " years")
+    print("Monthly mortgage payment: $" + format(monthly_payment, ".2f"))
+    print("Total payment: $" + format(total_payment, ".2f"))
+
+    mortgage_schedule(principal, interest_rate, years, cents=args.cents)
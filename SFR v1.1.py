@@ -1,20 +1,24 @@
-import os
-import sys
-import pandas as pd
-import numpy as np
 from datetime import datetime
-import tkinter as tk
-from tkinter import filedialog, simpledialog, messagebox
-from pathlib import Path
-import win32com.client as win32
-import pythoncom
+
+from sfr_ingest import read_table
+from sfr_platform import lazy_import, start_gui, filedialog, simpledialog, messagebox
+import sfr_profile
+from sfr_profile import span
+from sfr_report import ReportBuilder
+
+# Heavy imports are deferred to first use so the command line starts quickly
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+sfr_scenarios = lazy_import("sfr_scenarios")
 
 class SalesForecastDialog:
     def __init__(self, master=None):
         """Initialize the sales forecast dialog system"""
-        self.master = master or tk.Tk()
-        self.master.withdraw()  # Hide the main window
+        self.master = master or start_gui()  # Hidden root window, None when headless
+        if self.master is not None:
+            self.master.withdraw()  # Hide the main window
         self.products = []
+        self.history = None  # Sales history from the selected file, one column per product
     
     def select_excel_file(self):
         """Open file dialog to select Excel file"""
@@ -25,9 +29,9 @@ class SalesForecastDialog:
         return file_path
     
     def read_excel_data(self, file_path):
-        """Read data from Excel file"""
+        """Read data from Excel or CSV file"""
         try:
-            df = pd.read_excel(file_path)
+            df = read_table(file_path)
             return df
         except Exception as e:
             messagebox.showerror("Error", f"Could not read file: {str(e)}")
@@ -55,17 +59,38 @@ class SalesForecastDialog:
                     f"Enter expected growth rate (%) for {product_type}:"
                 )
                 
+                # Optional: left blank, it is fitted from the product's history if there is one
+                volatility = simpledialog.askfloat(
+                    "Growth Volatility",
+                    f"Enter monthly growth volatility (%) for {product_type} (Cancel to fit from history):"
+                )
+                
                 if current_units is not None and growth_rate is not None:
                     self.products.append({
                         'name': product_type,
                         'current_units': current_units,
-                        'growth_rate': growth_rate
+                        'growth_rate': growth_rate,
+                        'volatility': volatility
                     })
             except Exception as e:
                 messagebox.showerror("Input Error", str(e))
     
-    def generate_forecast(self, months=12):
-        """Generate sales forecast"""
+    def _volatility(self, product):
+        """User-entered volatility, else one fitted to the product's history column, else 0"""
+        if product.get('volatility') is not None:
+            return product['volatility']
+        if self.history is not None and product['name'] in self.history.columns:
+            try:
+                return sfr_scenarios.fit_growth(self.history[product['name']])[1]
+            except ValueError:
+                pass  # Too little history to fit
+        return 0.0
+    
+    def generate_forecast(self, months=12, scenarios=0, seed=None):
+        """
+        Generate sales forecast. With scenarios > 0, also draw that many growth paths
+        per product and add P10/P50/P90 bands of the monthly and total forecast.
+        """
         forecast_data = []
         
         for product in self.products:
@@ -82,35 +107,65 @@ class SalesForecastDialog:
                 'growth_rate': product['growth_rate']
             })
         
+        if scenarios and self.products:
+            volatilities = [self._volatility(product) for product in self.products]
+            with span("scenario_bands", products=len(self.products), scenarios=scenarios, months=months):
+                bands = sfr_scenarios.scenario_bands(
+                    [product['current_units'] for product in self.products],
+                    [product['growth_rate'] for product in self.products],
+                    volatilities, months, scenarios, seed=seed
+                )
+            for index, forecast in enumerate(forecast_data):
+                forecast['scenarios'] = scenarios
+                forecast['volatility'] = volatilities[index]
+                forecast['bands'] = {
+                    f"P{quantile}": {
+                        'monthly_forecast': bands['monthly'][index, position].tolist(),
+                        'total_forecast': float(bands['total'][index, position])
+                    }
+                    for position, quantile in enumerate(bands['quantiles'])
+                }
+        
         return forecast_data
     
-    def create_word_report(self, forecast_data):
-        """Create Word report using win32com"""
-        try:
-            word = win32.Dispatch("Word.Application")
-            word.Visible = False
-            doc = word.Documents.Add()
-            
-            # Title
-            doc.Content.Font.Size = 16
-            doc.Content.Text = "Sales Forecast Report\n"
-            doc.Content.Font.Bold = True
-            doc.Content.Paragraphs(1).Alignment = 1  # Center align
+    def build_report(self, forecast_data):
+        """Assemble the sales forecast report in memory"""
+        report = ReportBuilder()
+        
+        # Title
+        report.title("Sales Forecast Report")
+        
+        # Date
+        report.add(f"\nGenerated: {datetime.now().strftime('%Y-%m-%d')}\n")
+        
+        # Product Forecasts
+        for forecast in forecast_data:
+            report.add(f"Product: {forecast['product']}")
+            report.add(f"Growth Rate: {forecast['growth_rate']:.1f}%")
+            report.add(f"Total Forecast: {forecast['total_forecast']:,.0f} units")
+            report.add(f"Average Monthly Forecast: {forecast['average_forecast']:,.0f} units\n")
             
-            # Date
-            doc.Content.Text += f"\nGenerated: {datetime.now().strftime('%Y-%m-%d')}\n\n"
+            # Monthly Breakdown
+            report.add("Monthly Breakdown:")
+            monthly_text = " | ".join([f"{val:,.0f}" for val in forecast['monthly_forecast']])
+            report.add(monthly_text + "\n")
             
-            # Product Forecasts
-            for forecast in forecast_data:
-                doc.Content.Text += f"Product: {forecast['product']}\n"
-                doc.Content.Text += f"Growth Rate: {forecast['growth_rate']:.1f}%\n"
-                doc.Content.Text += f"Total Forecast: {forecast['total_forecast']:,.0f} units\n"
-                doc.Content.Text += f"Average Monthly Forecast: {forecast['average_forecast']:,.0f} units\n\n"
-                
-                # Monthly Breakdown
-                doc.Content.Text += "Monthly Breakdown:\n"
-                monthly_text = " | ".join([f"{val:,.0f}" for val in forecast['monthly_forecast']])
-                doc.Content.Text += monthly_text + "\n\n"
+            # Scenario Bands
+            if 'bands' in forecast:
+                report.add(f"Scenario Bands ({forecast['scenarios']:,} scenarios, "
+                           f"{forecast['volatility']:.1f}% monthly volatility):")
+                totals = " / ".join(f"{band['total_forecast']:,.0f}" for band in forecast['bands'].values())
+                report.add(f"Total Forecast {'/'.join(forecast['bands'])}: {totals} units")
+                for label, band in forecast['bands'].items():
+                    report.add(f"{label}: " + " | ".join(f"{val:,.0f}" for val in band['monthly_forecast']))
+                report.add("")
+        
+        return report
+    
+    def create_word_report(self, forecast_data):
+        """Create Word report, written to disk in a single pass"""
+        try:
+            report = self.build_report(forecast_data)
             
             # Save File Dialog
             save_path = filedialog.asksaveasfilename(
@@ -120,33 +175,31 @@ class SalesForecastDialog:
             )
             
             if save_path:
-                doc.SaveAs(save_path)
-                doc.Close()
-                word.Quit()
+                report.save(save_path)
                 messagebox.showinfo("Success", f"Report saved to {save_path}")
             
         except Exception as e:
             messagebox.showerror("Report Generation Error", str(e))
 
 def main():
-    pythoncom.CoInitialize()  # Initialize COM for threading
     forecast_dialog = SalesForecastDialog()
     
     # Optional: Excel file selection
     excel_file = forecast_dialog.select_excel_file()
     if excel_file:
-        excel_data = forecast_dialog.read_excel_data(excel_file)
-        # You can add logic to pre-populate or process Excel data if needed
+        # Product columns in the file are used to fit growth volatility
+        forecast_dialog.history = forecast_dialog.read_excel_data(excel_file)
     
     # Input product details
     forecast_dialog.input_product_details()
     
     # Generate forecast
     if forecast_dialog.products:
-        forecast_data = forecast_dialog.generate_forecast()
+        forecast_data = forecast_dialog.generate_forecast(scenarios=sfr_scenarios.DEFAULT_SCENARIOS)
         forecast_dialog.create_word_report(forecast_data)
     else:
         messagebox.showinfo("Notice", "No products entered for forecast.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with sfr_profile.session():  # Profiles to $SFR_PROFILE when it is set
+        main()
\ No newline at end of file
@@ -1,80 +1,140 @@
 import os
-import sys
-import pandas as pd
-import numpy as np
+import argparse
+import time
 from datetime import datetime
-import tkinter as tk
-from tkinter import filedialog, messagebox
-import win32com.client as win32
-import pythoncom
-from scipy import stats
+
+from sfr_incremental import ForecastState, refresh, watch
+from sfr_ingest import read_table
+from sfr_platform import lazy_import, start_gui, filedialog, messagebox
+import sfr_profile
+from sfr_profile import count, span
+from sfr_report import ReportBuilder
+
+# Heavy imports are deferred to first use so the command line starts quickly
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+sfr_models = lazy_import("sfr_models")
 
 class SalesForecastAnalyzer:
-    def __init__(self, excel_file):
-        self.df = pd.read_excel(excel_file)
+    def __init__(self, excel_file=None, df=None):
+        # Reuse an already parsed sheet when the caller has one
+        self.df = df if df is not None else read_table(excel_file)
         self.forecast_data = []
+        self.refitted = []  # Series refitted by the last incremental generate_forecast
+    
+    def _calculate_growth_rates(self, sales):
+        """Log-linear growth rate (%) for every column of a 2-D array in one least-squares pass"""
+        return sfr_models.log_linear_growth(sales)
     
     def _calculate_growth_rate(self, sales_column):
         """Calculate compound annual growth rate"""
-        try:
-            # Linear regression to estimate growth rate
-            x = np.arange(len(sales_column))
-            log_sales = np.log(sales_column)
-            slope, _, _, _, _ = stats.linregress(x, log_sales)
-            growth_rate = (np.exp(slope) - 1) * 100
-            return max(min(growth_rate, 50), -20)  # Cap growth between -20% and 50%
-        except Exception:
-            return 5  # Default growth rate if calculation fails
+        return float(self._calculate_growth_rates(sales_column)[0])
     
-    def generate_forecast(self, months=12):
-        """Automatically generate forecast for all numeric columns"""
-        for column in self.df.select_dtypes(include=[np.number]).columns:
-            if 'sales' in column.lower() or 'revenue' in column.lower():
-                current_value = self.df[column].iloc[-1]
-                growth_rate = self._calculate_growth_rate(self.df[column])
-                
-                monthly_forecast = [
-                    current_value * (1 + growth_rate/100) ** i 
-                    for i in range(months)
-                ]
-                
-                self.forecast_data.append({
-                    'product': column,
-                    'monthly_forecast': monthly_forecast,
-                    'total_forecast': sum(monthly_forecast),
-                    'average_forecast': np.mean(monthly_forecast),
-                    'growth_rate': growth_rate,
-                    'current_value': current_value
-                })
+    def _forecast_columns(self, sales, months, model='log_linear', workers=None):
+        """
+        Fit and project every column of sales at once: {column: forecast dict}.
+        model is a name from sfr_models.MODELS, or 'auto' to backtest every model
+        and keep the best one per series.
+        """
+        values = sales.to_numpy(dtype=float)
+        current_values = values[-1]
+        count("forecast.series", values.shape[1])
+        count("forecast.points", values.size)
+        if model == 'auto':
+            chosen = sfr_models.backtest(values, workers=workers)['best']
+        else:
+            chosen = [model] * values.shape[1]
+        
+        if model == 'log_linear':
+            # (months x columns) projection table in one broadcast
+            growth_rates = self._calculate_growth_rates(values)
+            periods = np.arange(months)[:, None]
+            forecasts = current_values * (1 + growth_rates / 100) ** periods
+        else:
+            # Month 0 is the current value, as for the log-linear projection
+            forecasts = np.vstack([current_values, sfr_models.forecast(values, months - 1, chosen)])
+            # Implied compound monthly growth over the forecast
+            with np.errstate(invalid='ignore', divide='ignore'):
+                growth_rates = ((forecasts[-1] / current_values) ** (1 / max(months - 1, 1)) - 1) * 100
+        totals = forecasts.sum(axis=0)
+        averages = forecasts.mean(axis=0)
         
+        results = {}
+        for i, column in enumerate(sales.columns):
+            forecast = {
+                'product': column,
+                'monthly_forecast': forecasts[:, i].tolist(),
+                'total_forecast': totals[i],
+                'average_forecast': averages[i],
+                'growth_rate': growth_rates[i],
+                'current_value': current_values[i],
+                'model': chosen[i]
+            }
+            forecast['report_lines'] = self._render_forecast(forecast)
+            results[column] = forecast
+        return results
+    
+    def generate_forecast(self, months=12, state=None, model='log_linear', workers=None):
+        """
+        Automatically generate forecast for all numeric columns with the given model
+        ('auto' picks the best model per series by backtest).
+        With a ForecastState only the series whose data changed since the last run are refitted.
+        """
+        numeric = self.df.select_dtypes(include=[np.number])
+        columns = [
+            column for column in numeric.columns
+            if 'sales' in str(column).lower() or 'revenue' in str(column).lower()
+        ]
+        if not columns:
+            return self.forecast_data
+        
+        with span("generate_forecast", series=len(columns), model=model, incremental=state is not None):
+            if state is None:
+                results = self._forecast_columns(numeric[columns], months, model, workers)
+            else:
+                results, self.refitted = refresh(
+                    state, numeric[columns],
+                    lambda sales: self._forecast_columns(sales, months, model, workers),
+                    settings={'months': months, 'model': model}
+                )
+        
+        self.forecast_data.extend(results.values())
         return self.forecast_data
     
+    def _render_forecast(self, forecast):
+        """Report lines for one product forecast"""
+        monthly_text = " | ".join([f"{val:,.0f}" for val in forecast['monthly_forecast']])
+        return [
+            f"Product: {forecast['product']}",
+            f"Current Value: {forecast['current_value']:,.2f}",
+            f"Forecast Model: {forecast.get('model', 'log_linear')}",
+            f"Projected Growth Rate: {forecast['growth_rate']:.1f}%",
+            f"Total Forecast: {forecast['total_forecast']:,.0f}",
+            f"Average Monthly Forecast: {forecast['average_forecast']:,.0f}\n",
+            # Monthly Breakdown
+            "Monthly Forecast Breakdown:",
+            monthly_text + "\n"
+        ]
+    
+    def build_report(self):
+        """Assemble the forecast report in memory"""
+        report = ReportBuilder()
+        
+        # Title and Metadata
+        report.title("Automated Sales Forecast Report")
+        report.add(f"\nGenerated: {datetime.now().strftime('%Y-%m-%d')}\n")
+        
+        # Product Forecasts, reusing lines rendered when each series was last fitted
+        for forecast in self.forecast_data:
+            for line in forecast.get('report_lines') or self._render_forecast(forecast):
+                report.add(line)
+        
+        return report
+    
     def create_word_report(self):
-        """Create comprehensive Word report"""
+        """Create comprehensive Word report, written to disk in a single pass"""
         try:
-            word = win32.Dispatch("Word.Application")
-            word.Visible = False
-            doc = word.Documents.Add()
-            
-            # Title and Metadata
-            doc.Content.Font.Size = 16
-            doc.Content.Text = "Automated Sales Forecast Report\n"
-            doc.Content.Font.Bold = True
-            doc.Content.Paragraphs(1).Alignment = 1  # Center align
-            doc.Content.Text += f"\nGenerated: {datetime.now().strftime('%Y-%m-%d')}\n\n"
-            
-            # Product Forecasts
-            for forecast in self.forecast_data:
-                doc.Content.Text += f"Product: {forecast['product']}\n"
-                doc.Content.Text += f"Current Value: {forecast['current_value']:,.2f}\n"
-                doc.Content.Text += f"Projected Growth Rate: {forecast['growth_rate']:.1f}%\n"
-                doc.Content.Text += f"Total Forecast: {forecast['total_forecast']:,.0f}\n"
-                doc.Content.Text += f"Average Monthly Forecast: {forecast['average_forecast']:,.0f}\n\n"
-                
-                # Monthly Breakdown
-                doc.Content.Text += "Monthly Forecast Breakdown:\n"
-                monthly_text = " | ".join([f"{val:,.0f}" for val in forecast['monthly_forecast']])
-                doc.Content.Text += monthly_text + "\n\n"
+            report = self.build_report()
             
             # Save File Dialog
             save_path = filedialog.asksaveasfilename(
@@ -84,18 +144,14 @@ class SalesForecastAnalyzer:
             )
             
             if save_path:
-                doc.SaveAs(save_path)
-                doc.Close()
-                word.Quit()
+                report.save(save_path)
                 messagebox.showinfo("Success", f"Report saved to {save_path}")
             
         except Exception as e:
             messagebox.showerror("Report Generation Error", str(e))
 
 def main():
-    pythoncom.CoInitialize()
-    root = tk.Tk()
-    root.withdraw()
+    start_gui()  # GUI and COM backend; nothing is started when headless
     
     # Select Excel File
     excel_file = filedialog.askopenfilename(
@@ -113,5 +169,40 @@ def main():
     else:
         messagebox.showinfo("Notice", "No file selected")
 
+def update_report(excel_file, output_dir, months=12, model='log_linear', workers=None):
+    """Headless: refresh the forecast for one workbook incrementally and save its report"""
+    started = time.perf_counter()
+    analyzer = SalesForecastAnalyzer(excel_file)
+    analyzer.generate_forecast(months, state=ForecastState(excel_file), model=model, workers=workers)
+    
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(excel_file))[0]
+    save_path = analyzer.build_report().save(os.path.join(output_dir, f"{stem}_forecast.docx"))
+    print(f"{excel_file}: refitted {len(analyzer.refitted)} of {len(analyzer.forecast_data)} series "
+          f"in {time.perf_counter() - started:.2f}s -> {save_path}")
+    return save_path
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Automated sales forecast reports.")
+    parser.add_argument("--watch", metavar="DIR", help="Watch DIR and re-forecast workbooks as they change")
+    parser.add_argument("--output-dir", default="reports", help="Where --watch writes the reports")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between directory scans")
+    parser.add_argument("--model", default="log_linear",
+                        help="Forecasting model from sfr_models.MODELS; auto backtests every model "
+                             "and keeps the best per series")
+    parser.add_argument("--workers", type=int, help="Backtest processes for --model auto (default: CPU count)")
+    sfr_profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+    # Checked here rather than with choices, so parsing the defaults does not import numpy
+    if args.model not in ("auto", "log_linear") and args.model not in sfr_models.MODELS:
+        parser.error(f"--model must be auto or one of {', '.join(sfr_models.MODELS)}")
+    return args
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    with sfr_profile.session(args.profile):
+        if args.watch:
+            watch(args.watch, lambda path: update_report(path, args.output_dir, model=args.model, workers=args.workers),
+                  args.interval)
+        else:
+            main()
\ No newline at end of file
@@ -1,60 +1,66 @@
-import os
-import pandas as pd
-import numpy as np
 from datetime import datetime
-import tkinter as tk
-from tkinter import filedialog, simpledialog, messagebox
-import win32com.client as win32
-import pythoncom
+
+from sfr_ingest import read_table
+from sfr_platform import lazy_import, start_gui, filedialog, simpledialog, messagebox
+import sfr_profile
+from sfr_profile import count, span
+from sfr_report import ReportBuilder
+
+# Heavy imports are deferred to first use so the command line starts quickly
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
 
 class RowSpecificAnalyzer:
     def __init__(self, excel_file, row_number, company_name):
         self.excel_file = excel_file
         self.row_number = row_number - 1  # Convert to 0-indexed
         self.company_name = company_name
-        self.df = pd.read_excel(excel_file, sheet_name=0)  # Read first sheet
+        self.df = read_table(excel_file, sheet_name=0)  # Read first sheet
     
     def analyze_row(self):
         """Analyze specific row data"""
         if self.row_number < 0 or self.row_number >= len(self.df):
             raise ValueError("Invalid row number")
         
-        row_data = self.df.iloc[self.row_number]
-        
-        # Identify numeric columns
-        numeric_columns = row_data[row_data.apply(np.isreal)].index.tolist()
+        with span("analyze_row", row=self.row_number + 1):
+            row_data = self.df.iloc[self.row_number]
+            
+            # Identify numeric columns
+            numeric_columns = row_data[row_data.apply(np.isreal)].index.tolist()
+        count("analyze_row.cells", len(row_data))
         
         return {
             'row_data': row_data,
             'numeric_columns': numeric_columns
         }
     
+    def build_report(self, analysis):
+        """Assemble the row analysis report in memory"""
+        report = ReportBuilder()
+        
+        # Title and Company Information
+        report.title(f"{self.company_name} - Row {self.row_number + 1} Analysis", size=None)
+        
+        # Report Details
+        report.add(f"\nReport Generated: {datetime.now().strftime('%Y-%m-%d')}\n")
+        
+        # Row Data
+        report.add("Row Details:")
+        for column, value in analysis['row_data'].items():
+            report.add(f"{column}: {value}")
+        
+        # Numeric Column Analysis
+        report.add("\nNumeric Column Analysis:")
+        for col in analysis['numeric_columns']:
+            report.add(f"{col}: {analysis['row_data'][col]}")
+        
+        return report
+    
     def generate_report(self):
-        """Create Word report for row analysis"""
+        """Create Word report for row analysis, written to disk in a single pass"""
         try:
             analysis = self.analyze_row()
-            
-            word = win32.Dispatch("Word.Application")
-            word.Visible = False
-            doc = word.Documents.Add()
-            
-            # Title and Company Information
-            doc.Content.Text = f"{self.company_name} - Row {self.row_number + 1} Analysis\n"
-            doc.Content.Font.Bold = True
-            doc.Content.Paragraphs(1).Alignment = 1
-            
-            # Report Details
-            doc.Content.Text += f"\nReport Generated: {datetime.now().strftime('%Y-%m-%d')}\n\n"
-            
-            # Row Data
-            doc.Content.Text += "Row Details:\n"
-            for column, value in analysis['row_data'].items():
-                doc.Content.Text += f"{column}: {value}\n"
-            
-            # Numeric Column Analysis
-            doc.Content.Text += "\nNumeric Column Analysis:\n"
-            for col in analysis['numeric_columns']:
-                doc.Content.Text += f"{col}: {analysis['row_data'][col]}\n"
+            report = self.build_report(analysis)
             
             # Save Report
             save_path = filedialog.asksaveasfilename(
@@ -64,18 +70,14 @@ class RowSpecificAnalyzer:
             )
             
             if save_path:
-                doc.SaveAs(save_path)
-                doc.Close()
-                word.Quit()
+                report.save(save_path)
                 messagebox.showinfo("Success", f"Report saved to {save_path}")
             
         except Exception as e:
             messagebox.showerror("Report Generation Error", str(e))
 
 def main():
-    pythoncom.CoInitialize()
-    root = tk.Tk()
-    root.withdraw()
+    start_gui()  # GUI and COM backend; nothing is started when headless
     
     # Select Excel File
     excel_file = filedialog.askopenfilename(
@@ -108,4 +110,5 @@ def main():
         messagebox.showinfo("Notice", "No file selected")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with sfr_profile.session():  # Profiles to $SFR_PROFILE when it is set
+        main()
\ No newline at end of file
@@ -1,17 +1,31 @@
+import operator
 import os
-import pandas as pd
-import numpy as np
+import time
+import warnings
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import tkinter as tk
-from tkinter import filedialog, simpledialog, messagebox
-import win32com.client as win32
-import pythoncom
+from functools import cached_property, lru_cache
+
+from sfr_ingest import read_table
+from sfr_platform import lazy_import, start_gui, filedialog, simpledialog, messagebox
+import sfr_profile
+from sfr_profile import count, span
+from sfr_report import ReportBuilder
+
+# Heavy imports are deferred to first use so the command line starts quickly
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+
+SUMMARY_PERCENTILES = (25, 50, 75)
+COLUMN_CACHE_SIZE = 4096  # Column letter/number conversions kept; the server passes client strings
 
 def get_row_input(df):
     """
-    Get and validate row input with a fixed range of 1-78 and actual file size
+    Get and validate row input against the actual file size
     """
-    max_row = min(78, len(df))  # Use either 78 or actual file size, whichever is smaller
+    max_row = len(df)
     
     while True:
         row_number = simpledialog.askinteger(
@@ -32,13 +46,354 @@ def get_row_input(df):
                 f"Please enter a row number between 1 and {max_row}"
             )
 
+def get_column_input(prompt):
+    """
+    Ask for a column as a number (e.g. 3) or an Excel letter (e.g. C)
+    """
+    while True:
+        value = simpledialog.askstring("Column", prompt)
+        
+        if value is None:  # User cancelled
+            return None
+        
+        value = value.strip()
+        if value.isdigit() and int(value) > 0:
+            return int(value)
+        if value.isalpha():
+            return value.upper()
+        messagebox.showerror("Invalid Input", "Please enter a column number or letter")
+
+def numeric_block(df):
+    """
+    Numeric view of df as a 2-D float array, one column at a time: numeric columns are
+    used as-is, other columns are parsed with to_numeric and text cells become NaN
+    """
+    columns = []
+    for name in df.columns:
+        column = df[name]
+        if pd.api.types.is_bool_dtype(column):
+            columns.append(np.full(len(column), np.nan))
+        elif pd.api.types.is_numeric_dtype(column):
+            columns.append(column.to_numpy(dtype=float, na_value=np.nan))
+        else:
+            columns.append(pd.to_numeric(column, errors='coerce').to_numpy(dtype=float, na_value=np.nan))
+    if not columns:
+        return np.empty((len(df), 0))
+    return np.column_stack(columns)
+
+def summarize_range(df, start_col, end_col, start_row=1, end_row=None, percentiles=SUMMARY_PERCENTILES):
+    """
+    Count, sum, mean, std, min, percentiles and max of the numeric cells in every row of a
+    rectangular range, computed in one pass over the numeric block. Rows and columns are
+    1-based and inclusive; end_row None means the last row. Returns a DataFrame indexed by row number.
+    """
+    block = numeric_block(df.iloc[start_row - 1:end_row, start_col - 1:end_col])
+    count = np.count_nonzero(~np.isnan(block), axis=1)
+    
+    # One sort per row puts the numbers first and NaN last, so min, max and the
+    # percentiles are all read from positions 0..count-1
+    ordered = np.sort(block, axis=1)
+    rows = np.arange(len(block))
+    
+    def order_statistic(fraction):
+        """Linearly interpolated value at fraction (0..1) of each row's numbers"""
+        if not block.shape[1]:
+            return np.full(len(block), np.nan)
+        position = fraction * np.maximum(count - 1, 0)
+        lower = np.floor(position).astype(np.intp)
+        upper = np.minimum(lower + 1, np.maximum(count - 1, 0))
+        value = ordered[rows, lower] + (position - lower) * (ordered[rows, upper] - ordered[rows, lower])
+        return np.where(count > 0, value, np.nan)
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # rows without numbers give NaN
+        summary = {
+            'count': count,
+            'sum': np.where(count > 0, np.nansum(block, axis=1), np.nan),
+            'mean': np.nanmean(block, axis=1),
+            'std': np.nanstd(block, axis=1, ddof=1),
+            'min': order_statistic(0.0),
+        }
+    for percentile in percentiles or ():
+        summary[f'p{percentile}'] = order_statistic(percentile / 100)
+    summary['max'] = order_statistic(1.0)
+    
+    index = pd.RangeIndex(start_row, start_row + len(block), name='row')
+    return pd.DataFrame(summary, index=index)
+
+@lru_cache(maxsize=COLUMN_CACHE_SIZE)
+def column_letter(column_number):
+    """Convert column number to Excel letter"""
+    result = ""
+    while column_number > 0:
+        column_number -= 1
+        result = chr(column_number % 26 + 65) + result
+        column_number //= 26
+    return result
+
+@lru_cache(maxsize=COLUMN_CACHE_SIZE)
+def column_number(column_letter):
+    """Convert Excel letter to column number"""
+    result = 0
+    for char in column_letter.upper():
+        result = result * 26 + (ord(char) - ord('A') + 1)
+    return result
+
+def resolve_column(column, column_count):
+    """
+    Column number of a column given as a number, a digit string or an Excel letter;
+    raises ValueError unless it is within 1..column_count
+    """
+    if isinstance(column, str):
+        text = column.strip().upper()
+        if text.isdigit():
+            number = int(text)
+        elif text.isascii() and text.isalpha():
+            number = column_number(text)
+        else:
+            raise ValueError(f"Invalid column {column!r}")
+    else:
+        try:
+            number = operator.index(column)
+        except TypeError:
+            raise ValueError(f"Invalid column {column!r}") from None
+    if not 1 <= number <= column_count:
+        last = f"A-{column_letter(column_count)}" if column_count else "no columns"
+        raise ValueError(f"Column {column} is outside the sheet ({last})")
+    return number
+
+def read_columns(excel_file, end_column=None):
+    """
+    First sheet of excel_file, parsing only columns 1..end_column (number or letter)
+    so columns past the analyzed range are never read; None reads every column
+    """
+    if end_column is None:
+        return read_table(excel_file, sheet_name=0)
+    text = str(end_column).strip().upper()
+    if text.isdigit():
+        end_col = int(text)
+    elif text.isascii() and text.isalpha():
+        end_col = column_number(text)
+    else:
+        end_col = 0
+    if end_col < 1:
+        return read_table(excel_file, sheet_name=0)  # Invalid; reported by the range checks
+    try:
+        return read_table(excel_file, sheet_name=0, usecols=list(range(end_col)))
+    except ValueError:
+        # end_column is past the last column: read the whole sheet and let the range checks report it
+        return read_table(excel_file, sheet_name=0)
+
+class RangeQueryIndex:
+    """
+    Precomputed range queries over one sheet: 2-D prefix sums of the numeric block for O(1) count, sum and mean over any rectangle, and
+    row-block sparse tables for min and max. Rows and columns are 1-based and
+    inclusive; columns may be numbers or letters. The tables are built on first use,
+    so callers that only need the numeric block never pay for them.
+    """
+    
+    def __init__(self, df, max_table_bytes=256 * 1024 * 1024):
+        with span("RangeQueryIndex.build", rows=len(df), columns=len(df.columns)):
+            self.df = df
+            self.block = numeric_block(df)
+        self.block_rows = self._block_rows(max_table_bytes)
+    
+    def _block_rows(self, max_bytes):
+        """
+        Rows per block of the min/max tables: the smallest power of two for which both
+        sparse tables (blocks x columns x levels floats each) fit in max_bytes together
+        """
+        rows, columns = self.block.shape
+        size = 1
+        while size < rows:
+            blocks = -(-rows // size)
+            if 2 * blocks * columns * blocks.bit_length() * 8 <= max_bytes:
+                break
+            size *= 2
+        return size
+    
+    @cached_property
+    def sums(self):
+        """Prefix sums with a zero first row and column: sums[r, c] covers rows < r, columns < c"""
+        with span("RangeQueryIndex.sums"):
+            sums = np.zeros((self.block.shape[0] + 1, self.block.shape[1] + 1))
+            sums[1:, 1:] = np.nan_to_num(self.block, nan=0.0).cumsum(axis=0).cumsum(axis=1)
+        return sums
+    
+    @cached_property
+    def counts(self):
+        """Prefix counts of the numeric cells, laid out like sums"""
+        counts = np.zeros((self.block.shape[0] + 1, self.block.shape[1] + 1), dtype=np.int64)
+        counts[1:, 1:] = (~np.isnan(self.block)).cumsum(axis=0).cumsum(axis=1)
+        return counts
+    
+    @cached_property
+    def minimum(self):
+        return self._sparse_table(np.fmin)
+    
+    @cached_property
+    def maximum(self):
+        return self._sparse_table(np.fmax)
+    
+    def _sparse_table(self, combine):
+        """
+        levels[i][b, c] combines column c over the 2**i row blocks starting at block b,
+        each block_rows rows tall; with one-row blocks level 0 is the numeric block itself
+        """
+        with span("RangeQueryIndex.sparse_table", block_rows=self.block_rows):
+            rows, columns = self.block.shape
+            if self.block_rows == 1 or not rows:
+                levels = [self.block]
+            else:
+                levels = [combine.reduceat(self.block, np.arange(0, rows, self.block_rows), axis=0)]
+            while 2 ** len(levels) <= len(levels[0]):
+                previous, height = levels[-1], 2 ** (len(levels) - 1)
+                levels.append(combine(previous[:-height], previous[height:]))
+        return levels
+    
+    def nbytes(self):
+        """Memory held by the numeric block and the tables built so far"""
+        arrays = {id(self.block): self.block}
+        for name in ('sums', 'counts'):
+            if name in self.__dict__:
+                arrays[id(self.__dict__[name])] = self.__dict__[name]
+        for name in ('minimum', 'maximum'):
+            for level in self.__dict__.get(name, ()):
+                arrays[id(level)] = level
+        return sum(array.nbytes for array in arrays.values())
+    
+    def column_number(self, column):
+        """Column number for a number, digit string or letter of this sheet (see resolve_column)"""
+        return resolve_column(column, self.block.shape[1])
+    
+    def _bounds(self, start_row, end_row, start_column, end_column):
+        """0-based half-open bounds of a rectangle"""
+        start_row, end_row = int(start_row), int(end_row)
+        start_col, end_col = self.column_number(start_column), self.column_number(end_column)
+        if not (1 <= start_row <= end_row <= self.block.shape[0] and 1 <= start_col <= end_col <= self.block.shape[1]):
+            raise ValueError(f"Range rows {start_row}-{end_row}, columns {start_column}-{end_column} is outside the sheet")
+        return start_row - 1, end_row, start_col - 1, end_col
+    
+    def _rectangle(self, table, start_row, end_row, start_column, end_column):
+        r0, r1, c0, c1 = self._bounds(start_row, end_row, start_column, end_column)
+        return table[r1, c1] - table[r0, c1] - table[r1, c0] + table[r0, c0]
+    
+    def count(self, start_row, end_row, start_column, end_column):
+        """Number of numeric cells in the rectangle"""
+        return int(self._rectangle(self.counts, start_row, end_row, start_column, end_column))
+    
+    def sum(self, start_row, end_row, start_column, end_column):
+        """Sum of the numeric cells in the rectangle (0.0 when there are none)"""
+        return float(self._rectangle(self.sums, start_row, end_row, start_column, end_column))
+    
+    def mean(self, start_row, end_row, start_column, end_column):
+        """Mean of the numeric cells in the rectangle (NaN when there are none)"""
+        count = self.count(start_row, end_row, start_column, end_column)
+        return self.sum(start_row, end_row, start_column, end_column) / count if count else np.nan
+    
+    def _extreme(self, levels, combine, start_row, end_row, start_column, end_column):
+        r0, r1, c0, c1 = self._bounds(start_row, end_row, start_column, end_column)
+        size = self.block_rows
+        first, last = -(-r0 // size), r1 // size  # Whole blocks inside the rows
+        if first >= last:
+            # Shorter than a block boundary to boundary: scan the (under 2 * block_rows) rows
+            return float(combine.reduce(self.block[r0:r1, c0:c1], axis=None))
+        
+        # Two overlapping runs of whole blocks, plus the partial blocks at either end
+        level = (last - first).bit_length() - 1
+        parts = [levels[level][[first, last - 2 ** level], c0:c1]]
+        for lo, hi in ((r0, first * size), (last * size, r1)):
+            if lo < hi:
+                parts.append(self.block[lo:hi, c0:c1])
+        return float(combine.reduce([combine.reduce(part, axis=None) for part in parts]))
+    
+    def min(self, start_row, end_row, start_column, end_column):
+        """Smallest numeric cell in the rectangle (NaN when there are none)"""
+        return self._extreme(self.minimum, np.fmin, start_row, end_row, start_column, end_column)
+    
+    def max(self, start_row, end_row, start_column, end_column):
+        """Largest numeric cell in the rectangle (NaN when there are none)"""
+        return self._extreme(self.maximum, np.fmax, start_row, end_row, start_column, end_column)
+
+def benchmark_queries(df, queries=10000, seed=0):
+    """
+    Time random rectangle queries (sum, mean, min, max) through RangeQueryIndex against
+    slicing the DataFrame for each query. Returns per-query latencies in microseconds.
+    """
+    rng = np.random.default_rng(seed)
+    rows, columns = df.shape
+    bounds = [
+        tuple(sorted(rng.integers(1, rows + 1, 2))) + tuple(sorted(rng.integers(1, columns + 1, 2)))
+        for _ in range(queries)
+    ]
+    
+    started = time.perf_counter()
+    index = RangeQueryIndex(df)
+    index.sums, index.counts, index.minimum, index.maximum  # Build the lazy tables up front
+    build_time = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    for start_row, end_row, start_col, end_col in bounds:
+        index.sum(start_row, end_row, start_col, end_col)
+        index.mean(start_row, end_row, start_col, end_col)
+        index.min(start_row, end_row, start_col, end_col)
+        index.max(start_row, end_row, start_col, end_col)
+    indexed = (time.perf_counter() - started) / queries * 1e6
+    
+    # The slicing baseline is slow, so it only runs a sample of the queries
+    sample = bounds[:max(1, queries // 20)]
+    started = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for start_row, end_row, start_col, end_col in sample:
+            values = numeric_block(df.iloc[start_row - 1:end_row, start_col - 1:end_col])
+            np.nansum(values), np.nanmean(values), np.nanmin(values), np.nanmax(values)
+    sliced = (time.perf_counter() - started) / len(sample) * 1e6
+    
+    print(f"Sheet: {rows} rows x {columns} columns, index built in {build_time * 1000:.1f} ms")
+    print(f"Slicing:  {sliced:,.1f} us per query")
+    print(f"Indexed:  {indexed:,.1f} us per query ({sliced / indexed if indexed else 0:,.0f}x faster)")
+    return {'build_ms': build_time * 1000, 'sliced_us': sliced, 'indexed_us': indexed}
+
+def build_range_report(company_name, row_number, start_column, end_column, analysis):
+    """Assemble the range analysis report in memory (row_number is 1-based)"""
+    report = ReportBuilder()
+    
+    # Title and Company Information
+    report.title(f"{company_name} - Detailed Range Analysis")
+    
+    # Report Details
+    report.add(f"\nReport Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    report.add(f"Analysis for Row: {row_number}")
+    report.add(f"Column Range: {start_column} to {end_column}\n")
+    
+    # Data Analysis
+    report.add("Selected Range Data:")
+    for col, value in analysis['row_data'].items():
+        formatted_value = f"{value:,.2f}" if isinstance(value, (int, float)) else str(value)
+        report.add(f"{col}: {formatted_value}")
+    
+    # Numeric Analysis
+    if not analysis['numeric_data'].empty:
+        report.add("\nNumeric Data Analysis:")
+        report.add(f"Total Sum: {analysis['numeric_data'].sum():,.2f}")
+        report.add(f"Average Value: {analysis['numeric_data'].mean():,.2f}")
+        report.add(f"Maximum Value: {analysis['numeric_data'].max():,.2f}")
+        report.add(f"Minimum Value: {analysis['numeric_data'].min():,.2f}")
+    
+    return report
+
 class RowColumnAnalyzer:
-    def __init__(self, excel_file, row_number, start_column, end_column, company_name):
+    def __init__(self, excel_file, row_number, start_column, end_column, company_name, df=None, index=None):
         self.excel_file = excel_file
-        self.df = pd.read_excel(excel_file, sheet_name=0)  # Read first sheet
+        # Reuse an already parsed sheet (and its RangeQueryIndex) when the caller has one
+        self.index = index
+        if df is None and index is not None:
+            df = index.df
+        self.df = df if df is not None else read_columns(excel_file, end_column)  # Read first sheet
         
-        # Validate row number against both fixed bounds and file size
-        max_row = min(78, len(self.df))
+        # Validate row number against the file size
+        max_row = len(self.df)
         if not 1 <= row_number <= max_row:
             raise ValueError(f"Row number must be between 1 and {max_row}")
         
@@ -49,34 +404,39 @@ class RowColumnAnalyzer:
     
     def _get_column_letter(self, column_number):
         """Convert column number to Excel letter"""
-        result = ""
-        while column_number > 0:
-            column_number -= 1
-            result = chr(column_number % 26 + 65) + result
-            column_number //= 26
-        return result
+        return column_letter(column_number)
     
     def _get_column_number(self, column_letter):
         """Convert Excel letter to column number"""
-        result = 0
-        for char in column_letter.upper():
-            result = result * 26 + (ord(char) - ord('A') + 1)
-        return result
+        return column_number(column_letter)
+    
+    def _column_bounds(self):
+        """Start and end column numbers, checked against the sheet (ValueError outside it)"""
+        if self.index is not None:
+            return self.index.column_number(self.start_column), self.index.column_number(self.end_column)
+        column_count = len(self.df.columns)
+        return resolve_column(self.start_column, column_count), resolve_column(self.end_column, column_count)
     
     def analyze_range(self):
         """Analyze specific row and column range data"""
         # Removed the row number validation here since it's already validated in __init__
-        
-        # Convert column letters to numbers if needed
-        start_col = self.start_column if isinstance(self.start_column, int) else self._get_column_number(self.start_column)
-        end_col = self.end_column if isinstance(self.end_column, int) else self._get_column_number(self.end_column)
+        with span("analyze_range", row=self.row_number + 1):
+            return self._analyze_range()
+    
+    def _analyze_range(self):
+        start_col, end_col = self._column_bounds()
+        count("analyze_range.cells", max(end_col - start_col + 1, 0))
         
         # Get column labels
         column_labels = self.df.columns[start_col-1:end_col]
         row_data = self.df.iloc[self.row_number, start_col-1:end_col]
         
-        # Identify numeric columns
-        numeric_data = row_data[row_data.apply(np.isreal)]
+        # Identify numeric cells, from the precomputed block when there is an index
+        if self.index is not None:
+            values = self.index.block[self.row_number, start_col-1:end_col]
+        else:
+            values = numeric_block(self.df.iloc[[self.row_number], start_col-1:end_col])[0]
+        numeric_data = pd.Series(values, index=column_labels)[~np.isnan(values)]
         
         return {
             'row_data': row_data,
@@ -84,39 +444,25 @@ class RowColumnAnalyzer:
             'numeric_data': numeric_data
         }
     
+    def summarize(self, start_row=1, end_row=None):
+        """Summary statistics of this analyzer's column range for every row (see summarize_range)"""
+        start_col, end_col = self._column_bounds()
+        return summarize_range(self.df, start_col, end_col, start_row, end_row)
+    
+    def build_report(self, analysis):
+        """Assemble the range analysis report in memory"""
+        return build_range_report(self.company_name, self.row_number + 1,
+                                  self.start_column, self.end_column, analysis)
+    
+    def save_report(self, save_path):
+        """Analyze the range and write the report to save_path without any dialogs"""
+        return self.build_report(self.analyze_range()).save(save_path)
+    
     def generate_report(self):
-        """Create Word report for range analysis"""
+        """Create Word report for range analysis, written to disk in a single pass"""
         try:
             analysis = self.analyze_range()
-            
-            word = win32.Dispatch("Word.Application")
-            word.Visible = False
-            doc = word.Documents.Add()
-            
-            # Title and Company Information
-            doc.Content.Font.Size = 16
-            doc.Content.Text = f"{self.company_name} - Detailed Range Analysis\n"
-            doc.Content.Font.Bold = True
-            doc.Content.Paragraphs(1).Alignment = 1
-            
-            # Report Details
-            doc.Content.Text += f"\nReport Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            doc.Content.Text += f"Analysis for Row: {self.row_number + 1}\n"
-            doc.Content.Text += f"Column Range: {self.start_column} to {self.end_column}\n\n"
-            
-            # Data Analysis
-            doc.Content.Text += "Selected Range Data:\n"
-            for col, value in analysis['row_data'].items():
-                formatted_value = f"{value:,.2f}" if isinstance(value, (int, float)) else str(value)
-                doc.Content.Text += f"{col}: {formatted_value}\n"
-            
-            # Numeric Analysis
-            if not analysis['numeric_data'].empty:
-                doc.Content.Text += "\nNumeric Data Analysis:\n"
-                doc.Content.Text += f"Total Sum: {analysis['numeric_data'].sum():,.2f}\n"
-                doc.Content.Text += f"Average Value: {analysis['numeric_data'].mean():,.2f}\n"
-                doc.Content.Text += f"Maximum Value: {analysis['numeric_data'].max():,.2f}\n"
-                doc.Content.Text += f"Minimum Value: {analysis['numeric_data'].min():,.2f}\n"
+            report = self.build_report(analysis)
             
             # Save Report
             save_path = filedialog.asksaveasfilename(
@@ -126,18 +472,14 @@ class RowColumnAnalyzer:
             )
             
             if save_path:
-                doc.SaveAs(save_path)
-                doc.Close()
-                word.Quit()
+                report.save(save_path)
                 messagebox.showinfo("Success", f"Report saved to {save_path}")
             
         except Exception as e:
             messagebox.showerror("Report Generation Error", str(e))
 
 def main():
-    pythoncom.CoInitialize()
-    root = tk.Tk()
-    root.withdraw()
+    start_gui()  # GUI and COM backend; nothing is started when headless
     
     # Select Excel File
     excel_file = filedialog.askopenfilename(
@@ -148,7 +490,7 @@ def main():
     if excel_file:
         try:
             # Load DataFrame
-            df = pd.read_excel(excel_file, sheet_name=0)
+            df = read_table(excel_file, sheet_name=0)
             
             # Prompt for Company Name
             company_name = simpledialog.askstring(
@@ -177,7 +519,7 @@ def main():
                 messagebox.showinfo("Notice", "Operation cancelled")
                 return
             
-            analyzer = RowColumnAnalyzer(excel_file, row_number, start_column, end_column, company_name)
+            analyzer = RowColumnAnalyzer(excel_file, row_number, start_column, end_column, company_name, df=df)
             analyzer.generate_report()
             
         except Exception as e:
@@ -185,5 +527,135 @@ def main():
     else:
         messagebox.showinfo("Notice", "No file selected")
 
+def _render_report(job):
+    """Process pool worker: build and save one report from an already computed analysis"""
+    save_path, company_name, row_number, start_column, end_column, analysis = job
+    build_range_report(company_name, row_number, start_column, end_column, analysis).save(save_path)
+    return save_path
+
+def _expand_workbooks(paths):
+    """Expand directories into the Excel workbooks they contain"""
+    workbooks = []
+    for path in paths:
+        if os.path.isdir(path):
+            workbooks.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith(('.xlsx', '.xls', '.csv')) and not name.startswith('~$')
+            ))
+        else:
+            workbooks.append(path)
+    return workbooks
+
+def batch_generate(workbooks, output_dir, start_column, end_column, company_name, rows=None, workers=None,
+                   summary=False):
+    """
+    Headless batch mode: analyze every row (or the given rows) of each workbook over
+    start_column..end_column (end_column None means the last column) and
+    render the reports on a process pool. Each workbook is parsed once and the
+    DataFrame is shared by all of its analyzers; only the small per-row analysis
+    results are sent to the workers, a bounded number at a time. With summary, the all-rows summary table of
+    each workbook is also written as <workbook>_summary.csv.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workbooks = _expand_workbooks(workbooks)
+    started = time.perf_counter()
+    report_count = 0
+    failures = []
+    
+    # Reports in flight are capped at two per worker, so memory does not grow with the batch size
+    window = 2 * (workers or os.cpu_count() or 1)
+    pending = deque()
+    
+    def collect():
+        """Wait for the oldest report in flight and record its outcome"""
+        nonlocal report_count
+        label, future = pending.popleft()
+        try:
+            future.result()
+            report_count += 1
+        except Exception as e:
+            failures.append((label, str(e)))
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for excel_file in workbooks:
+            try:
+                df = read_columns(excel_file, end_column)
+            except Exception as e:
+                failures.append((excel_file, str(e)))
+                continue
+            
+            stem = os.path.splitext(os.path.basename(excel_file))[0]
+            last_column = end_column or len(df.columns)
+            index = RangeQueryIndex(df)
+            if summary:
+                try:
+                    bounds = RowColumnAnalyzer(excel_file, 1, start_column, last_column, company_name, index=index)
+                    bounds.summarize().to_csv(os.path.join(output_dir, f"{stem}_summary.csv"))
+                except Exception as e:
+                    failures.append((f"{excel_file} summary", str(e)))
+            
+            for row_number in rows or range(1, len(df) + 1):
+                try:
+                    analyzer = RowColumnAnalyzer(excel_file, row_number, start_column, last_column, company_name, index=index)
+                    analysis = analyzer.analyze_range()
+                except Exception as e:
+                    failures.append((f"{excel_file} row {row_number}", str(e)))
+                    continue
+                save_path = os.path.join(output_dir, f"{stem}_row{row_number}.docx")
+                job = (save_path, company_name, row_number, start_column, last_column, analysis)
+                pending.append((f"{excel_file} row {row_number}", pool.submit(_render_report, job)))
+                if len(pending) >= window:
+                    collect()
+        
+        with span("batch.render", reports=len(pending)):
+            while pending:
+                collect()
+        count("batch.reports", report_count)
+    
+    elapsed = time.perf_counter() - started
+    print(f"Workbooks: {len(workbooks)}")
+    print(f"Reports written: {report_count} to {output_dir}")
+    print(f"Elapsed: {elapsed:.2f}s ({report_count / elapsed if elapsed else 0:,.1f} reports/s)")
+    for label, error in failures:
+        print(f"Failed: {label}: {error}")
+    return report_count, failures
+
+def _parse_rows(text):
+    """Parse a row selection such as '1-10,15' into row numbers"""
+    rows = []
+    for part in text.split(','):
+        first, _, last = part.partition('-')
+        rows.extend(range(int(first), int(last or first) + 1))
+    return rows
+
+def _parse_column(text):
+    """Columns may be given as numbers or Excel letters"""
+    return int(text) if text.isdigit() else text.upper()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Row and column range analysis reports.")
+    parser.add_argument("--batch", nargs="+", metavar="WORKBOOK",
+                        help="Generate reports headlessly for these workbooks or directories")
+    parser.add_argument("--company", default="", help="Company name for the report titles")
+    parser.add_argument("--start-column", type=_parse_column, default=1, help="First column (number or letter)")
+    parser.add_argument("--end-column", type=_parse_column, help="Last column (default: last column)")
+    parser.add_argument("--rows", type=_parse_rows, help="Rows to report on, e.g. 1-10,15 (default: all)")
+    parser.add_argument("--output-dir", default="reports", help="Directory for the generated reports")
+    parser.add_argument("--workers", type=int, help="Report rendering processes (default: CPU count)")
+    parser.add_argument("--summary", action="store_true", help="Also write each workbook's all-rows summary CSV")
+    parser.add_argument("--benchmark-queries", metavar="WORKBOOK",
+                        help="Time indexed range queries against DataFrame slicing on this workbook")
+    parser.add_argument("--queries", type=int, default=10000, help="Random queries for --benchmark-queries")
+    sfr_profile.add_arguments(parser)
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    with sfr_profile.session(args.profile):
+        if args.benchmark_queries:
+            benchmark_queries(read_table(args.benchmark_queries, sheet_name=0), args.queries)
+        elif args.batch:
+            batch_generate(args.batch, args.output_dir, args.start_column, args.end_column,
+                           args.company, args.rows, args.workers, args.summary)
+        else:
+            main()
\ No newline at end of file
@@ -0,0 +1,235 @@
+import math
+from collections import namedtuple
+
+# Online statistics over the tracker's sample stream. Every update is O(1) with bounded memory:
+#   Ewma             - time-aware exponentially weighted mean and variance of a rate
+#   RollingQuantiles - percentiles over a sliding time window from a log-bucketed sketch
+#   ThresholdAlert   - fires when a rate stays above a limit, clears with hysteresis
+#   StreamStats      - all of the above for upload and download, plus z-score anomaly alerts
+
+Alert = namedtuple('Alert', 'elapsed direction kind rate message')
+NO_ALERTS = ()
+
+UNITS = (('GB/s', 1e9), ('MB/s', 1e6), ('KB/s', 1e3))
+
+
+def format_rate(rate):
+    for unit, scale in UNITS:
+        if rate >= scale:
+            return f"{rate / scale:.2f} {unit}"
+    return f"{rate:.0f} B/s"
+
+
+def parse_rate(text):
+    # '500', '200K', '1.5M' or '1G' bytes per second
+    scale = {'K': 1e3, 'M': 1e6, 'G': 1e9}.get(text[-1:].upper(), 1)
+    return float(text[:-1] if scale != 1 else text) * scale
+
+
+class Ewma:
+    # Mean and variance decaying with a half-life in seconds, so irregular sample spacing
+    # (skipped ticks, different intervals) weighs samples by time rather than by count
+
+    __slots__ = ('halflife', 'mean', 'variance', 'samples', 'age')
+
+    def __init__(self, halflife=10.0):
+        self.halflife = halflife
+        self.mean = None
+        self.variance = 0.0
+        self.samples = 0
+        self.age = 0.0  # Seconds of history behind the estimates
+
+    def update(self, value, dt):
+        self.samples += 1
+        if self.mean is None:
+            self.mean = value
+            return
+        self.age += dt
+        alpha = 1.0 - math.exp(-math.log(2) * dt / self.halflife) if dt > 0 else 0.0
+        difference = value - self.mean
+        increment = alpha * difference
+        self.mean += increment
+        self.variance = (1.0 - alpha) * (self.variance + difference * increment)
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+
+class RollingQuantiles:
+    # Log-bucketed quantile sketch (DDSketch style) over the last `window` seconds.
+    # Values are counted in buckets whose bounds grow by a constant factor, so any quantile
+    # is returned within `relative_accuracy` of a true sample value. The window is split into
+    # `epochs` slots of buckets; the oldest slot is dropped whole as time moves on.
+
+    def __init__(self, window=300.0, epochs=10, relative_accuracy=0.01, min_value=1.0):
+        self.epoch_length = window / epochs
+        self.epochs = epochs
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value  # Smaller values (idle links) share one zero bucket
+        self.slots = [{} for _ in range(epochs)]
+        self.slot_epoch = [None] * epochs
+
+    def _slot(self, elapsed):
+        epoch = int(elapsed // self.epoch_length)
+        position = epoch % self.epochs
+        if self.slot_epoch[position] != epoch:
+            self.slots[position] = {}  # Drop the counts of the epoch that left the window
+            self.slot_epoch[position] = epoch
+        return self.slots[position]
+
+    def update(self, value, elapsed):
+        bucket = math.ceil(math.log(value) / self.log_gamma) if value >= self.min_value else None
+        slot = self._slot(elapsed)
+        slot[bucket] = slot.get(bucket, 0) + 1
+
+    def quantiles(self, fractions, elapsed):
+        # Quantiles of the samples in the window ending at `elapsed`: O(buckets), on demand only
+        current = int(elapsed // self.epoch_length)
+        counts = {}
+        for epoch, slot in zip(self.slot_epoch, self.slots):
+            if epoch is not None and current - self.epochs < epoch <= current:
+                for bucket, count in slot.items():
+                    counts[bucket] = counts.get(bucket, 0) + count
+        total = sum(counts.values())
+        if not total:
+            return [None] * len(fractions)
+
+        zero = counts.pop(None, 0)
+        buckets = sorted(counts.items())
+        results = []
+        for fraction in fractions:
+            rank = fraction * (total - 1)
+            if rank < zero:
+                results.append(0.0)
+                continue
+            seen = zero
+            for bucket, count in buckets:
+                seen += count
+                if seen > rank:
+                    # Midpoint of the bucket's bounds, within relative_accuracy of its values
+                    results.append(2 * self.gamma ** bucket / (self.gamma + 1))
+                    break
+        return results
+
+
+class ThresholdAlert:
+    # Fires once a rate has stayed above `limit` for `hold` seconds; clears once it drops
+    # below limit * (1 - hysteresis), so a rate hovering at the limit does not flap
+
+    __slots__ = ('limit', 'hold', 'hysteresis', 'above_since', 'active')
+
+    def __init__(self, limit, hold=5.0, hysteresis=0.1):
+        self.limit = limit
+        self.hold = hold
+        self.hysteresis = hysteresis
+        self.above_since = None
+        self.active = False
+
+    def update(self, rate, elapsed):
+        # Returns 'raised', 'cleared' or None
+        if rate > self.limit:
+            if self.above_since is None:
+                self.above_since = elapsed
+            if not self.active and elapsed - self.above_since >= self.hold:
+                self.active = True
+                return 'raised'
+            return None
+        if rate < self.limit * (1 - self.hysteresis):
+            self.above_since = None
+            if self.active:
+                self.active = False
+                return 'cleared'
+        return None
+
+
+class DirectionStats:
+    # Everything tracked for one direction (upload or download)
+
+    def __init__(self, name, halflife, window, limit, hold, anomaly_z, warmup):
+        self.name = name
+        self.rate = 0.0
+        self.ewma = Ewma(halflife)
+        self.sketch = RollingQuantiles(window)
+        self.threshold = ThresholdAlert(limit, hold) if limit else None
+        self.anomaly_z = anomaly_z
+        self.warmup = warmup
+        self.anomalous = False
+
+    def update(self, elapsed, rate, dt, alerts):
+        self.rate = rate
+        ewma = self.ewma
+
+        # Score against the statistics from before this sample, once they cover a half-life.
+        # Deviations under 1% of the mean never count, so a steady link does not alert on jitter.
+        if self.anomaly_z and ewma.samples >= self.warmup and ewma.age >= ewma.halflife:
+            std = max(ewma.std, 0.01 * abs(ewma.mean))
+            z = (rate - ewma.mean) / std if std > 0 else 0.0
+            if abs(z) >= self.anomaly_z and not self.anomalous:
+                self.anomalous = True
+                alerts.append(Alert(elapsed, self.name, 'anomaly', rate,
+                                    f"{self.name} {format_rate(rate)} is {z:+.1f} sd from "
+                                    f"the recent mean {format_rate(ewma.mean)}"))
+            elif abs(z) < self.anomaly_z / 2:
+                self.anomalous = False
+
+        ewma.update(rate, dt)
+        self.sketch.update(rate, elapsed)
+
+        if self.threshold is not None:
+            change = self.threshold.update(rate, elapsed)
+            if change == 'raised':
+                alerts.append(Alert(elapsed, self.name, 'threshold', rate,
+                                    f"{self.name} above {format_rate(self.threshold.limit)} "
+                                    f"for {self.threshold.hold:g}s: {format_rate(rate)}"))
+            elif change == 'cleared':
+                alerts.append(Alert(elapsed, self.name, 'cleared', rate,
+                                    f"{self.name} back below {format_rate(self.threshold.limit)}: "
+                                    f"{format_rate(rate)}"))
+
+
+class StreamStats:
+    # Online stage for the (elapsed, upload, download) samples of sample_data_usage, where
+    # upload and download are bytes since the previous sample
+
+    def __init__(self, halflife=10.0, window=300.0, quantiles=(0.5, 0.9, 0.99), upload_limit=None,
+                 download_limit=None, hold=5.0, anomaly_z=4.0, warmup=30):
+        self.quantile_fractions = quantiles
+        self.last_elapsed = 0.0
+        self.samples = 0
+        self.upload = DirectionStats('upload', halflife, window, upload_limit, hold, anomaly_z, warmup)
+        self.download = DirectionStats('download', halflife, window, download_limit, hold, anomaly_z, warmup)
+
+    def update(self, elapsed, upload, download):
+        # Feed one sample; returns the alerts it raised (usually none)
+        dt = elapsed - self.last_elapsed
+        self.last_elapsed = elapsed
+        self.samples += 1
+        if dt <= 0:
+            return NO_ALERTS
+        alerts = []
+        self.upload.update(elapsed, upload / dt, dt, alerts)
+        self.download.update(elapsed, download / dt, dt, alerts)
+        return alerts or NO_ALERTS
+
+    def summary(self):
+        result = {}
+        for direction in (self.upload, self.download):
+            quantiles = direction.sketch.quantiles(self.quantile_fractions, self.last_elapsed)
+            result[direction.name] = {
+                'rate': direction.rate,
+                'ewma': direction.ewma.mean,
+                'ewma_std': direction.ewma.std,
+                'quantiles': dict(zip(self.quantile_fractions, quantiles)),
+                'threshold_active': bool(direction.threshold and direction.threshold.active),
+            }
+        return result
+
+    def format_status(self):
+        parts = []
+        for name, stats in self.summary().items():
+            quantiles = " ".join(f"p{fraction * 100:g}={format_rate(value) if value is not None else '-'}"
+                                 for fraction, value in stats['quantiles'].items())
+            parts.append(f"{name} {format_rate(stats['rate'])} (ewma {format_rate(stats['ewma'] or 0)}, {quantiles})")
+        return f"[{self.last_elapsed:8.1f}s] " + " | ".join(parts)
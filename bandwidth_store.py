@@ -0,0 +1,195 @@
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+# On-disk layout of one segment file:
+#   header  - magic, format version, record count (16 bytes)
+#   records - fixed-width (timestamp, upload, download) rows, timestamps in epoch seconds
+HEADER = struct.Struct('<4sHxxQ')
+RECORD = struct.Struct('<dqq')
+RECORD_DTYPE = np.dtype([('timestamp', '<f8'), ('upload', '<i8'), ('download', '<i8')])
+MAGIC = b'BWTS'
+VERSION = 1
+SUFFIX = '.bwts'
+
+# Rollup resolutions (seconds) kept next to the raw samples; each rollup record holds the
+# bytes transferred during its bucket, stored with the same record layout in rollup-<n>s/
+ROLLUPS = (1, 60, 3600)
+
+
+def _rollup_directory(directory, seconds):
+    return os.path.join(directory, f"rollup-{seconds}s")
+
+
+def _segment_name(start_time):
+    return f"bandwidth-{int(start_time * 1000):015d}{SUFFIX}"
+
+
+def _segment_start(name):
+    return int(name[len('bandwidth-'):-len(SUFFIX)]) / 1000
+
+
+class BandwidthStoreWriter:
+    # Appends samples to memory-mapped, preallocated segment files in `directory`.
+    # A new segment starts when the current one holds `max_bytes` of records or is older than `max_age` seconds.
+    # Samples are also summed into the `rollups` resolutions as they arrive, so coarse views never need raw data.
+
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024, max_age=24 * 3600, rollups=ROLLUPS):
+        self.directory = directory
+        self.capacity = max(1, (max_bytes - HEADER.size) // RECORD.size)
+        self.max_age = max_age
+        self._file = None
+        self._map = None
+        self._count = 0
+        self._opened_at = None
+        os.makedirs(directory, exist_ok=True)
+        self._rollups = [
+            (seconds, BandwidthStoreWriter(_rollup_directory(directory, seconds), max_bytes, max_age, rollups=()), None)
+            for seconds in rollups
+        ]
+
+    def _roll_up(self, timestamp, upload, download):
+        for index, (seconds, writer, bucket) in enumerate(self._rollups):
+            bucket_start = timestamp - timestamp % seconds
+            if bucket is not None and bucket[0] != bucket_start:
+                writer.append(*bucket)
+                bucket = None
+            if bucket is None:
+                bucket = [bucket_start, 0, 0]
+            bucket[1] += upload
+            bucket[2] += download
+            self._rollups[index] = (seconds, writer, bucket)
+
+    def _open_segment(self, timestamp):
+        self._close_segment()
+        path = os.path.join(self.directory, _segment_name(timestamp))
+        while os.path.exists(path):
+            # Rotating twice within a millisecond; never overwrite an existing segment
+            timestamp += 0.001
+            path = os.path.join(self.directory, _segment_name(timestamp))
+        self._file = open(path, 'w+b')
+        self._file.truncate(HEADER.size + self.capacity * RECORD.size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, 0)
+        self._count = 0
+        self._opened_at = timestamp
+
+    def append(self, timestamp, upload, download):
+        if (self._map is None or self._count >= self.capacity
+                or (self.max_age is not None and timestamp - self._opened_at >= self.max_age)):
+            self._open_segment(timestamp)
+        RECORD.pack_into(self._map, HEADER.size + self._count * RECORD.size, timestamp, upload, download)
+        self._count += 1
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, self._count)
+        if self._rollups:
+            self._roll_up(timestamp, upload, download)
+
+    def flush(self):
+        if self._map is not None:
+            self._map.flush()
+
+    def _close_segment(self):
+        # Trim the unused preallocated tail so closed segments hold only their records.
+        # Rollup buckets are left open: rotating the raw segment must not split them.
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(HEADER.size + self._count * RECORD.size)
+        self._file.close()
+        self._map = None
+        self._file = None
+
+    def close(self):
+        # Emit partially filled rollup buckets, then close the rollup and raw segments
+        for index, (seconds, writer, bucket) in enumerate(self._rollups):
+            if bucket is not None:
+                writer.append(*bucket)
+            writer.close()
+            self._rollups[index] = (seconds, writer, None)
+        self._close_segment()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _read_header(mapped):
+    magic, version, count = HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a bandwidth store segment")
+    return count
+
+
+class BandwidthStoreReader:
+    # Reads a time window from a store directory. Segments are memory-mapped and the window is
+    # located by binary search on the (sorted) timestamps, so only the pages in the window are touched.
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def resolutions(self):
+        # Rollup resolutions (seconds) available in this store, finest first
+        return [seconds for seconds in ROLLUPS if os.path.isdir(_rollup_directory(self.directory, seconds))]
+
+    def segments(self):
+        names = sorted(name for name in os.listdir(self.directory)
+                       if name.startswith('bandwidth-') and name.endswith(SUFFIX))
+        return [(_segment_start(name), os.path.join(self.directory, name)) for name in names]
+
+    def _scan(self, start, end, visit):
+        # Call visit(records, lo, hi) on each memory-mapped segment overlapping [start, end) and
+        # collect the results; visit must not keep references to `records` once it returns
+        results = []
+        segments = self.segments()
+        for index, (segment_start, path) in enumerate(segments):
+            next_start = segments[index + 1][0] if index + 1 < len(segments) else None
+            if end is not None and segment_start >= end:
+                break
+            if start is not None and next_start is not None and next_start <= start:
+                continue
+            with open(path, 'rb') as handle:
+                if os.fstat(handle.fileno()).st_size < HEADER.size:
+                    continue
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    count = _read_header(mapped)
+                    records = np.frombuffer(mapped, RECORD_DTYPE, count, HEADER.size)
+                    timestamps = records['timestamp']
+                    lo = 0 if start is None else np.searchsorted(timestamps, start, 'left')
+                    hi = count if end is None else np.searchsorted(timestamps, end, 'left')
+                    results.append(visit(records, lo, hi))
+                    del records, timestamps
+        return results
+
+    def count(self, start=None, end=None):
+        # Number of samples in the window, found by binary search alone
+        return sum(self._scan(start, end, lambda records, lo, hi: int(hi - lo)))
+
+    def read(self, start=None, end=None):
+        # Return a structured array (timestamp, upload, download) of samples with start <= timestamp < end
+        parts = self._scan(start, end, lambda records, lo, hi: records[lo:hi].copy())
+        if not parts:
+            return np.empty(0, RECORD_DTYPE)
+        return np.concatenate(parts)
+
+    def read_for_width(self, start, end, max_points):
+        # Read the finest resolution (raw first, then the rollups) whose sample count in the window
+        # fits max_points, so zoomed-out views come from the hour rollup instead of raw samples.
+        # Returns the records and the resolution used (None for raw samples).
+        readers = [(None, self)] + [(seconds, BandwidthStoreReader(_rollup_directory(self.directory, seconds)))
+                                    for seconds in self.resolutions()]
+        for seconds, reader in readers:
+            if reader.count(start, end) <= max_points:
+                return reader.read(start, end), seconds
+        seconds, reader = readers[-1]
+        return reader.read(start, end), seconds
+
+    def read_last(self, seconds):
+        # Convenience window ending now
+        now = time.time()
+        return self.read(now - seconds, now)
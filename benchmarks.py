@@ -0,0 +1,319 @@
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(HERE, "benchmark_results")
+REGRESSION_THRESHOLD = 0.10  # Slowdowns above 10% are flagged by --compare
+
+_scripts = {}
+
+
+def load_script(filename):
+    """Import one of the repository scripts (their file names contain spaces)"""
+    if filename not in _scripts:
+        if HERE not in sys.path:
+            sys.path.insert(0, HERE)
+        name = "bench_" + "".join(char if char.isalnum() else "_" for char in os.path.splitext(filename)[0])
+        spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, filename))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _scripts[filename] = module
+    return _scripts[filename]
+
+
+def timed(function, repeat=5):
+    """Run function repeat times (after one warm-up run): (min, median) seconds"""
+    function()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return min(times), statistics.median(times)
+
+
+def result(name, params, items, function, repeat=5):
+    """Time function and describe it as one benchmark result processing `items` items per call"""
+    best, median = timed(function, repeat)
+    return {
+        'name': name,
+        'params': params,
+        'items': items,
+        'min_s': best,
+        'median_s': median,
+        'per_item_us': median / items * 1e6 if items else None,
+    }
+
+
+# Synthetic data
+
+def synthetic_loans(count, seed=0):
+    """Principals, annual rates (%) and terms (years) of random loans"""
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(50_000, 1_000_000, count).round(2),
+            rng.uniform(1.0, 9.0, count).round(3),
+            rng.choice([10, 15, 20, 30], count))
+
+
+def synthetic_sales_sheet(series, months=36, seed=0):
+    """A sales workbook as v1.2 reads it: one 'sales' column per product"""
+    rng = np.random.default_rng(seed)
+    growth = rng.normal(0.01, 0.02, series)
+    noise = rng.normal(1.0, 0.05, (months, series))
+    values = rng.uniform(100, 1000, series) * np.exp(np.outer(np.arange(months), growth)) * noise
+    return pd.DataFrame(values, columns=[f"Sales {index}" for index in range(series)])
+
+
+def synthetic_range_sheet(rows, columns=26, seed=0):
+    """A mostly numeric sheet with a text label column and a few missing cells, as v1.4 reads it"""
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(0, 10_000, (rows, columns - 1)).round(2)
+    values[rng.random(values.shape) < 0.02] = np.nan
+    df = pd.DataFrame(values, columns=[f"Col{index}" for index in range(1, columns)])
+    df.insert(0, "Label", [f"Item {index}" for index in range(rows)])
+    return df
+
+
+def synthetic_report(paragraphs, seed=0):
+    """A ReportBuilder with a title and the given number of text lines"""
+    from sfr_report import ReportBuilder
+    rng = np.random.default_rng(seed)
+    report = ReportBuilder()
+    report.title("Benchmark Report")
+    for index, value in enumerate(rng.uniform(0, 1e6, paragraphs)):
+        report.add(f"Line {index}: {value:,.2f} units & <growth> of {value / 1e4:.1f}%")
+    return report
+
+
+# Benchmarks; each returns a list of results and takes `quick` for smaller sizes
+
+def bench_mortgage(quick=False):
+    mortgage = load_script("Mortage Calculator.py")
+    loans = 200 if quick else 2000
+    principals, rates, years = synthetic_loans(loans)
+    results = [
+        result("mortgage.calculate_mortgage", {'loans': loans}, loans,
+               lambda: [mortgage.calculate_mortgage(p, r, y) for p, r, y in zip(principals, rates, years)]),
+        result("mortgage.mortgage_schedule", {'loans': 50}, 50,
+               lambda: [mortgage.mortgage_schedule(p, r, y, show=False)
+                        for p, r, y in zip(principals[:50], rates[:50], years[:50])]),
+        result("mortgage.amortization_schedules", {'loans': loans}, loans,
+               lambda: mortgage.amortization_schedules(principals, rates, years)),
+        result("mortgage.amortization_schedules_cents", {'loans': loans}, loans,
+               lambda: mortgage.amortization_schedules_cents(principals, rates, years)),
+    ]
+    return results
+
+
+def bench_forecast(quick=False):
+    forecast = load_script("SFR v1.2.py")
+    results = []
+    for width in ((10, 100) if quick else (10, 100, 1000, 5000)):
+        df = synthetic_sales_sheet(width)
+
+        results.append(result("sfr.generate_forecast", {'columns': width}, width,
+                              lambda: forecast.SalesForecastAnalyzer(df=df).generate_forecast()))
+    return results
+
+
+def bench_analyze_range(quick=False):
+    ranges = load_script("SFR v1.4.py")
+    results = []
+    for rows in ((100, 1000) if quick else (100, 1000, 10_000, 100_000)):
+        df = synthetic_range_sheet(rows)
+        index = ranges.RangeQueryIndex(df)
+        picks = np.random.default_rng(rows).integers(1, rows + 1, 200)
+        results.append(result("sfr.analyze_range", {'rows': rows}, len(picks), lambda: [
+            ranges.RowColumnAnalyzer(None, int(row), 'B', 'Z', 'Bench', df=df).analyze_range() for row in picks
+        ]))
+        results.append(result("sfr.analyze_range_indexed", {'rows': rows}, len(picks), lambda: [
+            ranges.RowColumnAnalyzer(None, int(row), 'B', 'Z', 'Bench', index=index).analyze_range() for row in picks
+        ]))
+        results.append(result("sfr.summarize_range", {'rows': rows}, rows,
+                              lambda: ranges.summarize_range(df, 2, 26), repeat=3))
+    return results
+
+
+def bench_report(quick=False):
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.docx")
+        for paragraphs in ((100, 1000) if quick else (100, 1000, 10_000)):
+            report = synthetic_report(paragraphs)
+            results.append(result("sfr.report_save_docx", {'paragraphs': paragraphs}, paragraphs,
+                                  lambda: report.save(path, backend="docx")))
+    return results
+
+
+def bench_blackjack(quick=False):
+    import blackjack
+    hands = 200 if quick else 2000
+    cards_per_hand = 5
+
+    def deck_deals():
+        # As the notebook plays: a fresh shuffled Deck and a Hand per round
+        for _ in range(hands):
+            deck = blackjack.Deck()
+            deck.shuffle()
+            hand = blackjack.Hand()
+            for _ in range(cards_per_hand):
+                hand.add_card(deck.deal())
+                hand.adjust_for_ace()
+
+    shoe = blackjack.Shoe(decks=6, seed=0)
+
+    def shoe_deals():
+        for _ in range(hands):
+            shoe.start_hand()
+            hand = blackjack.FastHand()
+            for _ in range(cards_per_hand):
+                hand.add_card(shoe.deal())
+                hand.adjust_for_ace()
+
+    params = {'hands': hands, 'cards_per_hand': cards_per_hand}
+    return [
+        result("blackjack.deck_hand_deals", params, hands * cards_per_hand, deck_deals),
+        result("blackjack.shoe_deals", params, hands * cards_per_hand, shoe_deals),
+    ]
+
+
+def bench_bandwidth(quick=False):
+    tracker = load_script("Bandwidth Tracker.py")
+    duration = 0.2 if quick else 1.0
+    samples = 10_000
+
+    def append():
+        ring = tracker.SampleRing(samples)
+        for index in range(samples):
+            ring.append(index * 0.1, index, index)
+
+    def stream_stats():
+        from bandwidth_stats import StreamStats
+        stats = StreamStats(upload_limit=1e9, download_limit=1e9)
+        for index in range(1, samples + 1):
+            stats.update(index * 0.01, 1000 + index % 97, 5000 + index % 89)
+
+    # Sampling every millisecond: the CPU time each sample costs the process
+    started_cpu = time.process_time()
+    ring = tracker.track_data_usage(interval=0.001, duration=duration, plot=False)
+    cpu = time.process_time() - started_cpu
+    return [
+        result("bandwidth.ring_append", {'samples': samples}, samples, append),
+        result("bandwidth.stream_stats_update", {'samples': samples}, samples, stream_stats),
+        {
+            'name': "bandwidth.sampling_overhead",
+            'params': {'duration_s': duration},
+            'items': len(ring),
+            'min_s': cpu,
+            'median_s': cpu,
+            'per_item_us': cpu / len(ring) * 1e6 if len(ring) else None,
+        },
+    ]
+
+
+BENCHMARKS = {
+    'mortgage': bench_mortgage,
+    'forecast': bench_forecast,
+    'analyze_range': bench_analyze_range,
+    'report': bench_report,
+    'blackjack': bench_blackjack,
+    'bandwidth': bench_bandwidth,
+}
+
+
+def git_revision():
+    """Short commit hash of the working tree, or 'unknown'"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(names=None, quick=False):
+    """Run the selected benchmarks and return the JSON-ready results document"""
+    results = []
+    for name in names or BENCHMARKS:
+        try:
+            cases = BENCHMARKS[name](quick)
+        except ImportError as e:
+            print(f"{name}: skipped ({e})")  # e.g. psutil is missing for the bandwidth tracker
+            continue
+        for case in cases:
+            per_item = f"{case['per_item_us']:,.2f} us/item" if case['per_item_us'] is not None else "-"
+            print(f"{case['name']:<38} {json.dumps(case['params']):<22} {case['median_s'] * 1000:>10.2f} ms  {per_item}")
+        results.extend(cases)
+    return {
+        'commit': git_revision(),
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPUs)",
+        'quick': quick,
+        'results': results,
+    }
+
+
+def compare(previous, current, threshold=REGRESSION_THRESHOLD):
+    """Print the change of every benchmark present in both runs; returns the regressions"""
+    def key(case):
+        return case['name'], json.dumps(case['params'], sort_keys=True)
+
+    before = {key(case): case for case in previous['results']}
+    regressions = []
+    print(f"\nChange from {previous['commit']} to {current['commit']}:")
+    for case in current['results']:
+        old = before.get(key(case))
+        if old is None or not old['median_s']:
+            continue
+        change = case['median_s'] / old['median_s'] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{case['name']:<38} {json.dumps(case['params']):<22} {change:+8.1%}{flag}")
+        if flag:
+            regressions.append((case, change))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the repository's hot paths.")
+    parser.add_argument("benchmarks", nargs="*", metavar="BENCHMARK",
+                        help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes for a fast check")
+    parser.add_argument("--output", help="Results file (default: benchmark_results/<commit>.json)")
+    parser.add_argument("--compare", metavar="RESULTS", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    document = run(args.benchmarks, args.quick)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{document['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as handle:
+        json.dump(document, handle, indent=1)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(json.load(handle), document, args.threshold)
+        sys.exit(1 if regressions else 0)
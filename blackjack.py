@@ -0,0 +1,208 @@
+# Card, Deck, Hand and Chips classes from "Milestone 2-BlackJack.ipynb", importable so the
+# game rules can be reused outside the notebook (e.g. by blackjack_sim).
+import random
+import time
+from array import array
+
+import numpy as np
+
+suits = ('Hearts', 'Diamonds', 'Spades', 'Clubs')
+ranks = ('Two', 'Three', 'Four', 'Five', 'Six', 'Seven', 'Eight', 'Nine', 'Ten', 'Jack', 'Queen', 'King', 'Ace')
+values = {'Two':2, 'Three':3, 'Four':4, 'Five':5, 'Six':6, 'Seven':7, 'Eight':8, 'Nine':9, 'Ten':10, 'Jack':10,
+          'Queen':10, 'King':10, 'Ace':11}
+
+
+# CARD CLASS
+class Card:
+    
+    def __init__(self,suit,rank):
+        self.suit = suit
+        self.rank = rank
+        
+    def __str__(self):
+        return self.rank + ' of ' + self.suit
+
+
+# DECK CLASS
+class Deck:
+    
+    def __init__(self):
+        self.deck = []
+        for suit in suits:
+            for rank in ranks:
+                self.deck.append(Card(suit,rank)) # Builds the card objects and adds to the list
+                
+    def __str__(self):
+        deck_comp = ''  #start with an empty string
+        for card in self.deck:
+            deck_comp += '\n' +card.__str__() #adds each Card object's print string
+        return 'The deck has:' + deck_comp
+    
+    def shuffle(self):
+        random.shuffle(self.deck)
+        
+    def deal(self):
+        single_card = self.deck.pop()
+        return single_card
+
+
+class Hand:
+    
+    def __init__(self):
+        self.cards = [] # start with an empty list similar to the Deck class
+        self.value = 0 # start with zero value
+        self.aces = 0 # add an attribute to keep track of aces
+        
+    def add_card(self,card):
+        self.cards.append(card)
+        self.value += values[card.rank]
+        if card.rank == 'Ace':
+            self.aces += 1 # add to self.aces
+            
+    def adjust_for_ace(self):
+        while self.value > 21 and self.aces:
+            self.value -= 10
+            self.aces -= 1
+
+
+# Tracking starting players chip's function
+class Chips:
+    
+    def __init__(self):
+        self.total = 100 # This can be set to a default value or supplied by a user input
+        self.bet = 0
+        
+    def win_bet(self):
+        self.total += self.bet
+    
+    def lose_bet(self):
+        self.total -= self.bet
+
+
+# Taking hits
+def hit(deck,hand):
+    
+    hand.add_card(deck.deal())
+    hand.adjust_for_ace()
+
+
+# COMPACT SHOE
+# Cards are encoded as small ints, code = suit index * 13 + rank index, so a shoe of N decks
+# is a flat byte array and a hand's value is a table lookup instead of Card objects and dict lookups.
+CARD_VALUES = tuple(values[ranks[code % 13]] for code in range(52))
+CARD_IS_ACE = tuple(int(ranks[code % 13] == 'Ace') for code in range(52))
+CARDS = tuple(Card(suits[code // 13], ranks[code % 13]) for code in range(52))  # Card view of every code
+
+
+def card_code(card):
+    return suits.index(card.suit) * 13 + ranks.index(card.rank)
+
+
+class Shoe:
+    # N decks stored as a byte array, dealt by advancing a position. The shoe is reshuffled
+    # once the cut card (at `penetration` of the shoe) has been reached, between hands, and
+    # mid-hand if a deep cut card lets the shoe run out (the cards in play are then reshuffled too).
+
+    __slots__ = ('decks', 'cards', 'position', 'cut_card', 'rng', 'shuffles')
+
+    def __init__(self, decks=6, penetration=0.75, seed=None):
+        if not 0 < penetration <= 1:
+            raise ValueError("penetration must be in (0, 1]")
+        self.decks = decks
+        self.cards = array('B', bytes(range(52)) * decks)
+        self.cut_card = int(len(self.cards) * penetration)
+        self.rng = np.random.default_rng(seed)
+        self.shuffles = 0
+        self.shuffle()
+
+    def __len__(self):
+        return len(self.cards) - self.position
+
+    def shuffle(self):
+        self.cards = array('B', self.rng.permutation(np.frombuffer(self.cards, dtype=np.uint8)).tobytes())
+        self.position = 0
+        self.shuffles += 1
+
+    def start_hand(self):
+        # Call before each hand: reshuffles only when the cut card has come out
+        if self.position >= self.cut_card:
+            self.shuffle()
+
+    def deal(self):
+        try:
+            code = self.cards[self.position]
+        except IndexError:
+            self.shuffle()
+            code = self.cards[0]
+        self.position += 1
+        return code
+
+
+class FastHand:
+    # Hand of card codes with the same add_card/adjust_for_ace rules as Hand
+
+    __slots__ = ('cards', 'value', 'aces')
+
+    def __init__(self):
+        self.cards = []
+        self.value = 0
+        self.aces = 0
+
+    def add_card(self, code):
+        self.cards.append(code)
+        self.value += CARD_VALUES[code]
+        self.aces += CARD_IS_ACE[code]
+
+    def adjust_for_ace(self):
+        while self.value > 21 and self.aces:
+            self.value -= 10
+            self.aces -= 1
+
+
+class ShoeDeck(Deck):
+    # Deck API (deck list, shuffle, deal returning Card) as a thin view over a Shoe
+
+    def __init__(self, decks=1, penetration=1.0, seed=None):
+        self.shoe = Shoe(decks, penetration, seed)
+
+    @property
+    def deck(self):
+        # Remaining cards, in the same order Deck.deal would pop them (last is dealt first)
+        return [CARDS[code] for code in reversed(self.shoe.cards[self.shoe.position:])]
+
+    def shuffle(self):
+        self.shoe.shuffle()
+
+    def deal(self):
+        return CARDS[self.shoe.deal()]
+
+
+def benchmark_deals(hands=20000, cards_per_hand=5, decks=6):
+    # Compare deals/second of a fresh shuffled Deck per hand (as the notebook plays) with the shoe
+    started = time.perf_counter()
+    for _ in range(hands):
+        deck = Deck()
+        deck.shuffle()
+        hand = Hand()
+        for _ in range(cards_per_hand):
+            hand.add_card(deck.deal())
+            hand.adjust_for_ace()
+    deck_rate = hands * cards_per_hand / (time.perf_counter() - started)
+
+    shoe = Shoe(decks, seed=0)
+    started = time.perf_counter()
+    for _ in range(hands):
+        shoe.start_hand()
+        hand = FastHand()
+        for _ in range(cards_per_hand):
+            hand.add_card(shoe.deal())
+            hand.adjust_for_ace()
+    shoe_rate = hands * cards_per_hand / (time.perf_counter() - started)
+
+    print(f"Deck per hand: {deck_rate:,.0f} deals/s")
+    print(f"{decks}-deck shoe: {shoe_rate:,.0f} deals/s ({shoe_rate / deck_rate:.1f}x)")
+    return {'deck_deals_per_s': deck_rate, 'shoe_deals_per_s': shoe_rate}
+
+
+if __name__ == "__main__":
+    benchmark_deals()
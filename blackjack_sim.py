@@ -0,0 +1,213 @@
+# Headless Monte Carlo simulator for the notebook's blackjack rules.
+# Player decisions come from a pluggable policy instead of hit_or_stand, and hands are
+# spread over a process pool with independent, reproducibly seeded random streams.
+import argparse
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from blackjack import CARDS, Deck, FastHand, Hand, Shoe, hit
+from blackjack_strategy import BasicStrategy
+
+WIN, PUSH, LOSS = 1, 0, -1
+
+
+class StandOn:
+    # Policy: hit until the hand reaches `threshold`, then stand (StandOn(17) mimics the dealer)
+
+    def __init__(self, threshold=17):
+        self.threshold = threshold
+
+    def __call__(self, player, dealer_upcard):
+        return player.value < self.threshold
+
+    def __repr__(self):
+        return f"StandOn({self.threshold})"
+
+
+class NeverBust:
+    # Policy: only hit when no single card can bust the hand
+
+    def __call__(self, player, dealer_upcard):
+        return player.value <= 11
+
+    def __repr__(self):
+        return "NeverBust()"
+
+
+# Policies selectable from the command line. A policy is any picklable callable
+# policy(player_hand, dealer_upcard) -> True to hit, False to stand.
+POLICIES = {
+    'stand17': StandOn(17),
+    'stand15': StandOn(15),
+    'stand12': StandOn(12),
+    'never-bust': NeverBust(),
+    'basic': BasicStrategy(1),
+    'basic6': BasicStrategy(6),
+}
+
+
+def play_hand(policy):
+    # Play one hand with the notebook's rules and return WIN, PUSH or LOSS for the player
+    deck = Deck()
+    deck.shuffle()
+
+    player_hand = Hand()
+    player_hand.add_card(deck.deal())
+    player_hand.add_card(deck.deal())
+    player_hand.adjust_for_ace()  # two aces count as 12, not a bust
+
+    dealer_hand = Hand()
+    dealer_hand.add_card(deck.deal())
+    dealer_hand.add_card(deck.deal())
+    dealer_hand.adjust_for_ace()
+    dealer_upcard = dealer_hand.cards[1]  # show_some reveals the dealer's second card
+
+    while policy(player_hand, dealer_upcard):
+        hit(deck, player_hand)
+        if player_hand.value > 21:
+            return LOSS
+
+    # Dealer hits until she reaches 17
+    while dealer_hand.value < 17:
+        hit(deck, dealer_hand)
+
+    if dealer_hand.value > 21 or dealer_hand.value < player_hand.value:
+        return WIN
+    if dealer_hand.value > player_hand.value:
+        return LOSS
+    return PUSH
+
+
+def play_shoe_hand(policy, shoe):
+    # Same rules as play_hand, dealt from a multi-deck Shoe of card codes; the policy still sees a Card upcard
+    shoe.start_hand()
+    deal = shoe.deal
+
+    player_hand = FastHand()
+    player_hand.add_card(deal())
+    player_hand.add_card(deal())
+    player_hand.adjust_for_ace()
+
+    dealer_hand = FastHand()
+    dealer_hand.add_card(deal())
+    dealer_hand.add_card(deal())
+    dealer_hand.adjust_for_ace()
+    dealer_upcard = CARDS[dealer_hand.cards[1]]
+
+    while policy(player_hand, dealer_upcard):
+        player_hand.add_card(deal())
+        player_hand.adjust_for_ace()
+        if player_hand.value > 21:
+            return LOSS
+
+    while dealer_hand.value < 17:
+        dealer_hand.add_card(deal())
+        dealer_hand.adjust_for_ace()
+
+    if dealer_hand.value > 21 or dealer_hand.value < player_hand.value:
+        return WIN
+    if dealer_hand.value > player_hand.value:
+        return LOSS
+    return PUSH
+
+
+def _simulate_chunk(job):
+    # Process pool worker: play `hands` hands on a private random stream, return outcome counts.
+    # decks=None plays a fresh single Deck per hand like the notebook; otherwise a Shoe is used.
+    hands, policy, seed, decks, penetration = job
+    counts = {WIN: 0, PUSH: 0, LOSS: 0}
+    if decks is None:
+        random.seed(seed)
+        for _ in range(hands):
+            counts[play_hand(policy)] += 1
+    else:
+        shoe = Shoe(decks, penetration, seed)
+        for _ in range(hands):
+            counts[play_shoe_hand(policy, shoe)] += 1
+    return counts[WIN], counts[PUSH], counts[LOSS]
+
+
+def _chunk_sizes(hands, chunk_size):
+    return [min(chunk_size, hands - start) for start in range(0, hands, chunk_size)]
+
+
+def summarize(wins, pushes, losses, elapsed, z=1.96):
+    # Outcome rates and mean return per unit bet, with normal-approximation confidence intervals
+    n = wins + pushes + losses
+    mean = (wins - losses) / n
+    variance = (wins + losses) / n - mean ** 2
+    margin = z * math.sqrt(variance / n)
+    summary = {
+        'hands': n,
+        'elapsed': elapsed,
+        'hands_per_second': n / elapsed if elapsed else float('inf'),
+        'expected_return': (mean, mean - margin, mean + margin),
+    }
+    for name, count in (('win', wins), ('push', pushes), ('loss', losses)):
+        p = count / n
+        half = z * math.sqrt(p * (1 - p) / n)
+        summary[name] = (p, p - half, p + half)
+    return summary
+
+
+def simulate(hands, policy=StandOn(17), workers=None, seed=None, chunk_size=100000, decks=None, penetration=0.75):
+    # Simulate `hands` hands across a process pool. Every chunk gets its own seed spawned from
+    # `seed`, so results are reproducible for a given seed and chunk size whatever the worker count.
+    # Pass `decks` to deal from a multi-deck shoe reshuffled at `penetration` instead of a new Deck per hand.
+    if hands < 1:
+        raise ValueError("hands must be at least 1")
+    sizes = _chunk_sizes(hands, chunk_size)
+    seeds = [int(child.generate_state(1, np.uint64)[0])
+             for child in np.random.SeedSequence(seed).spawn(len(sizes))]
+    jobs = [(size, policy, chunk_seed, decks, penetration) for size, chunk_seed in zip(sizes, seeds)]
+    if hasattr(policy, 'prepare'):
+        policy.prepare()  # e.g. build BasicStrategy's table once here rather than in every worker
+
+    started = time.perf_counter()
+    if workers == 1:
+        results = map(_simulate_chunk, jobs)
+        totals = [sum(column) for column in zip(*results)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            totals = [sum(column) for column in zip(*pool.map(_simulate_chunk, jobs))]
+    elapsed = time.perf_counter() - started
+    return summarize(*totals, elapsed)
+
+
+def print_summary(summary, policy):
+    print(f"Policy: {policy!r}")
+    print(f"Hands: {summary['hands']:,} in {summary['elapsed']:.2f}s ({summary['hands_per_second']:,.0f} hands/s)")
+    for name in ('win', 'push', 'loss'):
+        p, lo, hi = summary[name]
+        print(f"{name.title():<5} {p:.4%}  (95% CI {lo:.4%} .. {hi:.4%})")
+    mean, lo, hi = summary['expected_return']
+    print(f"Expected return per unit bet: {mean:+.5f}  (95% CI {lo:+.5f} .. {hi:+.5f})")
+    print(f"House edge: {-mean:.4%}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo blackjack simulation.")
+    parser.add_argument("--hands", type=int, default=1000000, help="Number of hands to simulate")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="stand17", help="Player strategy")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, help="Root seed for reproducible runs")
+    parser.add_argument("--decks", type=int, help="Deal from a shoe of DECKS decks instead of a fresh deck per hand")
+    parser.add_argument("--penetration", type=float, default=0.75, help="Shoe fraction dealt before reshuffling")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="Hands per work unit")
+    args = parser.parse_args(argv)
+    if args.hands < 1:
+        parser.error("--hands must be at least 1")
+    if not 0 < args.penetration <= 1:
+        parser.error("--penetration must be in (0, 1]")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    policy = POLICIES[args.policy]
+    print_summary(simulate(args.hands, policy, args.workers, args.seed, args.chunk_size,
+                           args.decks, args.penetration), policy)
@@ -0,0 +1,222 @@
+# Exact dealer outcome probabilities and a precomputed hit/stand basic-strategy table for the
+# notebook's rules (dealer hits below 17, ties push, no doubling or splitting).
+# Tables are built once, saved as .npz and loaded at startup, so a decision is one array index.
+import argparse
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from blackjack import CARD_VALUES, FastHand, Shoe, values
+
+# Dealer final totals tracked by the outcome vectors: 17, 18, 19, 20, 21, bust
+DEALER_OUTCOMES = (17, 18, 19, 20, 21, 'bust')
+BUST = 5
+
+# Bumped whenever the tables change meaning, so files saved by older code are rebuilt
+TABLE_VERSION = 2
+
+# Card values by composition slot: slot 0 is the ace, slots 1-9 are 2..10
+SLOT_VALUES = (11, 2, 3, 4, 5, 6, 7, 8, 9, 10)
+
+STRATEGY_DIR = os.environ.get("BLACKJACK_STRATEGY_DIR", os.path.dirname(os.path.abspath(__file__)))
+
+
+def shoe_composition(decks=1):
+    # Cards per slot in a fresh shoe: four of each rank per deck, sixteen ten-valued cards
+    return tuple(4 * decks if value != 10 else 16 * decks for value in SLOT_VALUES)
+
+
+def _slot(value):
+    return 0 if value == 11 else value - 1
+
+
+def _add(total, aces, value):
+    # Hand.add_card followed by adjust_for_ace; `aces` counts the aces still counting 11
+    total += value
+    aces += value == 11
+    while total > 21 and aces:
+        total -= 10
+        aces -= 1
+    return total, aces
+
+
+@lru_cache(maxsize=None)
+def _dealer(total, aces, composition):
+    # Probability vector over DEALER_OUTCOMES for a dealer hand drawing from `composition`
+    outcome = np.zeros(len(DEALER_OUTCOMES))
+    if total > 21:
+        outcome[BUST] = 1.0
+        return outcome
+    if total >= 17:
+        outcome[total - 17] = 1.0
+        return outcome
+
+    remaining = sum(composition)
+    for slot, count in enumerate(composition):
+        if not count:
+            continue
+        drawn = composition[:slot] + (count - 1,) + composition[slot + 1:]
+        outcome += count / remaining * _dealer(*_add(total, aces, SLOT_VALUES[slot]), drawn)
+    outcome.flags.writeable = False
+    return outcome
+
+
+def dealer_distribution(upcard_value, composition):
+    # Exact distribution of the dealer's final total given the upcard value (ace = 11), found by
+    # memoized recursion over the remaining shoe composition
+    slot = _slot(upcard_value)
+    composition = tuple(composition)
+    remaining = composition[:slot] + (composition[slot] - 1,) + composition[slot + 1:]
+    return _dealer(upcard_value, int(upcard_value == 11), remaining)
+
+
+def stand_ev(total, dealer):
+    # Expected return of standing on `total` against a dealer outcome vector
+    if total > 21:
+        return -1.0
+    win = dealer[BUST]
+    loss = 0.0
+    for index, final in enumerate(DEALER_OUTCOMES[:BUST]):
+        if final < total:
+            win += dealer[index]
+        elif final > total:
+            loss += dealer[index]
+    return win - loss
+
+
+def build_strategy(decks=1):
+    # Tables indexed [soft, player total, dealer upcard value]:
+    #   hit      - 1 where hitting has the higher expected return
+    #   ev_stand / ev_hit - expected return per unit bet of each play
+    # Player draws use the shoe less the dealer's upcard (a total-dependent strategy).
+    composition = shoe_composition(decks)
+    hit = np.zeros((2, 22, 12), dtype=np.int8)
+    ev_stand = np.zeros((2, 22, 12))
+    ev_hit = np.zeros((2, 22, 12))
+
+    for upcard in range(2, 12):
+        dealer = dealer_distribution(upcard, composition)
+        slot = _slot(upcard)
+        deck = composition[:slot] + (composition[slot] - 1,) + composition[slot + 1:]
+        probabilities = np.array(deck) / sum(deck)
+
+        @lru_cache(maxsize=None)
+        def best(total, aces):
+            if total > 21:
+                return -1.0, -1.0
+            hit_value = 0.0
+            for p, value in zip(probabilities, SLOT_VALUES):
+                hit_value += p * max(best(*_add(total, aces, value)))
+            return stand_ev(total, dealer), hit_value
+
+        for soft in (0, 1):
+            for total in range(4, 22):
+                if soft and total < 12:
+                    continue
+                stand_value, hit_value = best(total, soft)
+                ev_stand[soft, total, upcard] = stand_value
+                ev_hit[soft, total, upcard] = hit_value
+                hit[soft, total, upcard] = hit_value > stand_value
+
+    return {'hit': hit, 'ev_stand': ev_stand, 'ev_hit': ev_hit, 'decks': np.array(decks),
+            'version': np.array(TABLE_VERSION)}
+
+
+def strategy_path(decks):
+    return os.path.join(STRATEGY_DIR, f"basic_strategy_{decks}deck.npz")
+
+
+def load_strategy(decks=1, rebuild=False):
+    # Load the serialized tables for `decks`, building and saving them on first use (or when
+    # they were saved by an older TABLE_VERSION). The file is written under a temporary name
+    # and renamed into place, so a concurrent reader never sees a partly written table.
+    path = strategy_path(decks)
+    if not rebuild and os.path.exists(path):
+        with np.load(path) as tables:
+            if 'version' in tables.files and tables['version'] == TABLE_VERSION:
+                return {name: tables[name] for name in tables.files}
+    tables = build_strategy(decks)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as handle:
+        np.savez_compressed(handle, **tables)
+    os.replace(temporary, path)
+    return tables
+
+
+class BasicStrategy:
+    # Simulator policy: a table lookup on (soft, player total, dealer upcard). The table is loaded
+    # on first use, so the policy stays cheap to pickle into worker processes.
+
+    def __init__(self, decks=1):
+        self.decks = decks
+        self.table = None
+
+    def prepare(self):
+        # Load (building and saving if needed) the table; simulate calls this before starting
+        # workers, so they only ever read the finished file
+        if self.table is None:
+            self.table = load_strategy(self.decks)['hit']
+
+    def __call__(self, player, dealer_upcard):
+        if self.table is None:
+            self.prepare()
+        return self.table[int(player.aces > 0), player.value, values[dealer_upcard.rank]]
+
+    def __getstate__(self):
+        return {'decks': self.decks, 'table': None}
+
+    def __repr__(self):
+        return f"BasicStrategy({self.decks})"
+
+
+def check_dealer(decks=1, hands=300000, seed=0):
+    # Compare dealer_distribution with dealer hands played out from a Shoe by the simulator's
+    # rules. Prints simulated and exact bust rates per upcard and the largest gap over all
+    # outcomes in standard errors; returns the worst gap (a few standard errors at most if exact).
+    shoe = Shoe(decks, seed=seed)
+    counts = np.zeros((12, len(DEALER_OUTCOMES)))
+    for _ in range(hands):
+        shoe.start_hand()
+        hand = FastHand()
+        hand.add_card(shoe.deal())
+        upcard = CARD_VALUES[hand.cards[0]]
+        while hand.value < 17:
+            hand.add_card(shoe.deal())
+            hand.adjust_for_ace()
+        counts[upcard, BUST if hand.value > 21 else hand.value - 17] += 1
+
+    composition = shoe_composition(decks)
+    worst = 0.0
+    print("Upcard  bust (simulated)  bust (exact)  max gap")
+    for upcard in range(2, 12):
+        n = counts[upcard].sum()
+        simulated = counts[upcard] / n
+        exact = dealer_distribution(upcard, composition)
+        error = np.sqrt(exact * (1 - exact) / n)
+        gap = np.max(np.abs(simulated - exact) / np.where(error > 0, error, np.inf))
+        worst = max(worst, gap)
+        print(f"{'A' if upcard == 11 else upcard:>6}  {simulated[BUST]:>16.4%}  {exact[BUST]:>12.4%}  {gap:>5.1f} se")
+    return worst
+
+
+def print_chart(tables):
+    upcards = list(range(2, 12))
+    print("Total  " + " ".join(f"{'A' if u == 11 else u:>2}" for u in upcards))
+    for soft, label in ((0, 'Hard'), (1, 'Soft')):
+        for total in range(12 if soft else 5, 22):
+            row = " ".join(" H" if tables['hit'][soft, total, u] else " S" for u in upcards)
+            print(f"{label} {total:<2} {row}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build and show the hit/stand basic-strategy table.")
+    parser.add_argument("--decks", type=int, default=1, help="Decks in the shoe")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute even if a saved table exists")
+    parser.add_argument("--check", type=int, metavar="HANDS",
+                        help="Compare the exact dealer outcomes with HANDS simulated dealer hands instead")
+    args = parser.parse_args()
+    if args.check:
+        check_dealer(args.decks, args.check)
+    else:
+        print_chart(load_strategy(args.decks, args.rebuild))
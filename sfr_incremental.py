@@ -0,0 +1,112 @@
+import hashlib
+import os
+import pickle
+import time
+
+from sfr_platform import lazy_import
+
+pd = lazy_import("pandas")  # Imported on first use
+
+from sfr_ingest import CACHE_DIR
+
+BLOCK_ROWS = 4096
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+
+
+def column_block_hashes(df, block_rows=BLOCK_ROWS):
+    """Hash every column of df in blocks of block_rows rows: {column: (block hash, ...)}"""
+    hashes = {}
+    for column in df.columns:
+        row_hashes = pd.util.hash_pandas_object(df[column], index=False).to_numpy()
+        hashes[column] = tuple(
+            hashlib.sha1(row_hashes[start:start + block_rows].tobytes()).hexdigest()
+            for start in range(0, max(len(row_hashes), 1), block_rows)
+        )
+    return hashes
+
+
+class ForecastState:
+    def __init__(self, workbook, state_dir=None):
+        """Fit results and block hashes from the last run on a workbook, persisted between runs"""
+        state_dir = state_dir or os.path.join(CACHE_DIR, "state")
+        key = hashlib.sha1(os.path.abspath(workbook).encode()).hexdigest()
+        self.path = os.path.join(state_dir, key + ".pkl")
+        self.settings = None
+        self.entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "rb") as handle:
+                    self.settings, self.entries = pickle.load(handle)
+            except Exception:
+                self.settings, self.entries = None, {}  # A damaged state file means a full refit
+
+    def save(self):
+        """Write the state back to disk"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as handle:
+            pickle.dump((self.settings, self.entries), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.path)
+
+
+def refresh(state, df, fit, settings=None):
+    """
+    Bring the stored results for every column of df up to date, refitting only
+    columns whose row blocks changed (or everything if settings changed).
+    fit(sub_df) must return {column: result} for the columns of sub_df.
+    Returns ({column: result} in df column order, list of refitted columns).
+    """
+    if state.settings != settings:
+        state.entries = {}
+        state.settings = settings
+
+    hashes = column_block_hashes(df)
+    changed = [
+        column for column in df.columns
+        if column not in state.entries or state.entries[column]['hashes'] != hashes[column]
+    ]
+    if changed:
+        for column, result in fit(df[changed]).items():
+            state.entries[column] = {'hashes': hashes[column], 'result': result}
+
+    # Forget series that are no longer in the sheet
+    for column in set(state.entries) - set(df.columns):
+        del state.entries[column]
+
+    state.save()
+    return {column: state.entries[column]['result'] for column in df.columns}, changed
+
+
+def _scan(directory):
+    """Modification time and size of every workbook in directory"""
+    stamps = {}
+    for name in os.listdir(directory):
+        if name.lower().endswith(WORKBOOK_EXTENSIONS) and not name.startswith('~$'):
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Removed between listdir and stat
+            stamps[path] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+
+def watch(directory, on_change, interval=5.0, stop_event=None, max_polls=None):
+    """Poll directory and call on_change(path) for each new or modified workbook"""
+    seen = {}
+    polls = 0
+    while stop_event is None or not stop_event.is_set():
+        current = _scan(directory)
+        for path, stamp in sorted(current.items()):
+            if seen.get(path) != stamp:
+                try:
+                    on_change(path)
+                except Exception as e:
+                    # Often a workbook still being saved; retry on the next poll
+                    print(f"Could not process {path}: {e}")
+                    current.pop(path)
+        seen = current
+        polls += 1
+        if max_polls is not None and polls >= max_polls:
+            break
+        time.sleep(interval)
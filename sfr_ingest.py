@@ -0,0 +1,160 @@
+import hashlib
+import os
+import pickle
+
+from sfr_platform import lazy_import
+from sfr_profile import count, span
+
+pd = lazy_import("pandas")  # Imported on first use
+
+# Parsed frames are cached here, keyed by file content hash and mtime. Once the cached frames
+# exceed CACHE_MAX_BYTES the least recently used ones are evicted, so edited or renamed
+# workbooks do not leave entries behind forever.
+CACHE_DIR = os.environ.get("SFR_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".sfr_cache"))
+CACHE_MAX_BYTES = int(os.environ.get("SFR_CACHE_MAX_MB", "1024")) * 1024 * 1024
+CACHE_SUFFIXES = (".feather", ".pkl")
+
+XLSX_MAGIC = b"PK\x03\x04"
+XLS_MAGIC = b"\xd0\xcf\x11\xe0"
+
+
+def detect_format(path):
+    """Return 'xlsx', 'xls' or 'csv' from the file signature, falling back to the extension"""
+    with open(path, "rb") as handle:
+        head = handle.read(4)
+    if head == XLSX_MAGIC:
+        return "xlsx"
+    if head == XLS_MAGIC:
+        return "xls"
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    return extension if extension in ("xlsx", "xlsm", "xls") else "csv"
+
+
+def file_fingerprint(path, chunk_size=1 << 20):
+    """Content hash plus modification time of a file"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return f"{digest.hexdigest()}-{os.stat(path).st_mtime_ns}"
+
+
+def _cache_key(path, sheet_name, usecols):
+    options = repr((sheet_name, sorted(usecols) if usecols is not None else None))
+    return hashlib.sha1(f"{file_fingerprint(path)}|{options}".encode()).hexdigest()
+
+
+def _engine_available(module):
+    """Check whether an optional parser package is installed"""
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def _parse(path, file_format, sheet_name, usecols):
+    """Parse a workbook or CSV with the fastest reader that is installed"""
+    if file_format == "csv":
+        engine = "pyarrow" if _engine_available("pyarrow") else "c"
+        return pd.read_csv(path, usecols=usecols, engine=engine)
+    engine = "calamine" if _engine_available("python_calamine") else None
+    return pd.read_excel(path, sheet_name=sheet_name, usecols=usecols, engine=engine)
+
+
+def _load_cached(cache_path):
+    """Load a cached frame from Feather or pickle, marking the entry as recently used"""
+    if os.path.exists(cache_path + ".feather"):
+        df = pd.read_feather(cache_path + ".feather")
+        os.utime(cache_path + ".feather")
+        return df
+    if os.path.exists(cache_path + ".pkl"):
+        with open(cache_path + ".pkl", "rb") as handle:
+            df = pickle.load(handle)
+        os.utime(cache_path + ".pkl")
+        return df
+    return None
+
+
+def _store_cached(cache_path, df):
+    """Store a frame as Feather when pyarrow can represent it, otherwise as pickle"""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    try:
+        df.to_feather(cache_path + ".feather")
+        return
+    except Exception:
+        if os.path.exists(cache_path + ".feather"):
+            os.remove(cache_path + ".feather")
+    with open(cache_path + ".pkl", "wb") as handle:
+        pickle.dump(df, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def read_table(path, sheet_name=0, usecols=None, cache=True):
+    """
+    Read an Excel sheet or CSV file into a DataFrame.
+    Only the requested sheet and columns are parsed, and unchanged files are
+    served from the on-disk cache instead of being parsed again.
+    """
+    with span("read_table", path=os.path.basename(path)):
+        df = _read_table(path, sheet_name, usecols, cache)
+    count("read_table.bytes", os.path.getsize(path))
+    count("read_table.rows", len(df))
+    count("read_table.columns", len(df.columns))
+    return df
+
+
+def _read_table(path, sheet_name, usecols, cache):
+    file_format = detect_format(path)
+    cache_path = None
+    if cache:
+        cache_path = os.path.join(CACHE_DIR, _cache_key(path, sheet_name, usecols))
+        with span("read_table.cache_lookup"):
+            try:
+                df = _load_cached(cache_path)
+            except Exception:
+                df = None  # Unreadable cache entries are simply rebuilt
+        if df is not None:
+            count("read_table.cache_hits")
+            return df
+
+    with span("read_table.parse", format=file_format):
+        df = _parse(path, file_format, sheet_name, usecols)
+    if cache_path is not None:
+        with span("read_table.cache_store"):
+            try:
+                _store_cached(cache_path, df)
+                prune_cache()
+            except OSError:
+                pass  # A read-only cache directory must not stop the analysis
+    return df
+
+
+def prune_cache(max_bytes=CACHE_MAX_BYTES):
+    """Evict the least recently used cached frames until the cache fits max_bytes; returns the number evicted"""
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith(CACHE_SUFFIXES):
+            path = os.path.join(CACHE_DIR, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+        evicted += 1
+    count("read_table.cache_evictions", evicted)
+    return evicted
+
+
+def clear_cache():
+    """Remove every cached frame"""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith(CACHE_SUFFIXES):
+            os.remove(os.path.join(CACHE_DIR, name))
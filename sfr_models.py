@@ -0,0 +1,208 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from sfr_profile import count, span
+
+# Log-linear growth is capped to this range (%), and DEFAULT_GROWTH is used where no fit is possible
+GROWTH_LIMITS = (-20, 50)
+DEFAULT_GROWTH = 5.0
+
+# Holt smoothing parameters are picked per series from this grid by in-sample one-step error
+HOLT_ALPHAS = (0.2, 0.4, 0.6, 0.8)
+HOLT_BETAS = (0.05, 0.2, 0.4)
+
+SEASON = 12
+MOVING_AVERAGE_WINDOW = 3
+MIN_TRAINING = 3  # Shortest history a backtest fold trains on
+
+
+def _as_columns(values):
+    """2-D float array with one series per column"""
+    values = np.asarray(values, dtype=float)
+    return values[:, None] if values.ndim == 1 else values
+
+
+def _fill(values):
+    """Fill missing months with the previous value (leading gaps with the first value)"""
+    values = _as_columns(values)
+    rows = np.arange(len(values))[:, None]
+    last_valid = np.maximum.accumulate(np.where(np.isnan(values), 0, rows), axis=0)
+    filled = values[last_valid, np.arange(values.shape[1])]
+    first_valid = np.argmax(~np.isnan(values), axis=0)
+    leading = rows < first_valid
+    return np.where(leading, values[first_valid, np.arange(values.shape[1])], filled)
+
+
+def log_linear_growth(values):
+    """Log-linear growth rate (%) for every column of a 2-D array in one least-squares pass"""
+    values = _as_columns(values)
+
+    # Fit only finite, positive points; masked-out points get zero weight
+    valid = np.isfinite(values) & (values > 0)
+    weights = valid.astype(float)
+    log_sales = np.log(np.where(valid, values, 1.0)) * weights
+    x = np.arange(values.shape[0], dtype=float)
+
+    # Normal equations of y = a + b*x for all columns at once
+    n = weights.sum(axis=0)
+    sum_x = x @ weights
+    sum_xx = (x * x) @ weights
+    sum_y = log_sales.sum(axis=0)
+    sum_xy = x @ log_sales
+    denominator = n * sum_xx - sum_x ** 2
+
+    fitted = (n >= 2) & (denominator > 0)
+    slope = np.divide(n * sum_xy - sum_x * sum_y, denominator,
+                      out=np.zeros_like(n), where=fitted)
+    growth_rate = np.clip((np.exp(slope) - 1) * 100, *GROWTH_LIMITS)
+    return np.where(fitted, growth_rate, DEFAULT_GROWTH)
+
+
+def log_linear(values, horizon):
+    """Compound the fitted log-linear growth rate from the last observed value"""
+    growth = log_linear_growth(values)
+    last = _fill(values)[-1]
+    steps = np.arange(1, horizon + 1)[:, None]
+    return last * (1 + growth / 100) ** steps
+
+
+def holt(values, horizon):
+    """
+    Holt's linear exponential smoothing. Every (alpha, beta) pair of the grid is run
+    for every series at once and each series keeps the pair with the lowest
+    one-step-ahead squared error.
+    """
+    y = _fill(values)
+    grid = np.array([(alpha, beta) for alpha in HOLT_ALPHAS for beta in HOLT_BETAS])
+    alpha, beta = grid[:, 0:1], grid[:, 1:2]
+
+    level = np.repeat(y[:1], len(grid), axis=0)
+    trend = np.repeat(y[1:2] - y[:1], len(grid), axis=0) if len(y) > 1 else np.zeros_like(level)
+    errors = np.zeros_like(level)
+    for observed in y[1:]:
+        predicted = level + trend
+        errors += (observed - predicted) ** 2
+        new_level = alpha * observed + (1 - alpha) * predicted
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        level = new_level
+
+    best = np.argmin(np.where(np.isnan(errors), np.inf, errors), axis=0)
+    series = np.arange(y.shape[1])
+    steps = np.arange(1, horizon + 1)[:, None]
+    return level[best, series] + steps * trend[best, series]
+
+
+def seasonal_naive(values, horizon):
+    """Repeat the last full season (naive last value when the history is shorter)"""
+    y = _fill(values)
+    if len(y) < SEASON:
+        return np.repeat(y[-1:], horizon, axis=0)
+    return y[len(y) - SEASON + np.arange(horizon) % SEASON]
+
+
+def moving_average(values, horizon):
+    """Flat forecast at the mean of the last MOVING_AVERAGE_WINDOW months"""
+    y = _fill(values)
+    return np.repeat(y[-MOVING_AVERAGE_WINDOW:].mean(axis=0, keepdims=True), horizon, axis=0)
+
+
+# Every model takes (months x series, horizon) and returns (horizon x series)
+MODELS = {
+    'log_linear': log_linear,
+    'holt': holt,
+    'seasonal_naive': seasonal_naive,
+    'moving_average': moving_average,
+}
+
+
+def forecast(values, horizon, model='log_linear'):
+    """
+    Forecast the next horizon months of every column. model is a registry name,
+    or one name per column (e.g. the 'best' list from backtest).
+    """
+    values = _as_columns(values)
+    if isinstance(model, str):
+        return MODELS[model](values, horizon)
+    choice = np.asarray(model)
+    result = np.full((horizon, values.shape[1]), np.nan)
+    for name in np.unique(choice):
+        columns = choice == name
+        result[:, columns] = MODELS[name](values[:, columns], horizon)
+    return result
+
+
+def _backtest_chunk(job):
+    """Mean absolute error of every model on a block of columns: (models x columns)"""
+    values, horizon, folds, models = job
+    errors = np.zeros((len(models), values.shape[1]))
+    counts = np.zeros((len(models), values.shape[1]))
+    last_origin = len(values) - horizon
+    for origin in range(max(MIN_TRAINING, last_origin - folds + 1), last_origin + 1):
+        actual = values[origin:origin + horizon]
+        for index, name in enumerate(models):
+            error = np.abs(MODELS[name](values[:origin], horizon) - actual)
+            scored = np.isfinite(error)
+            errors[index] += np.where(scored, error, 0).sum(axis=0)
+            counts[index] += scored.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, errors / counts, np.inf)
+
+
+def backtest(values, horizon=3, folds=3, models=None, workers=None, chunk_size=1000):
+    """
+    Rolling-origin backtest: each of the last `folds` origins trains on the history
+    before it and is scored on the next `horizon` months. Column blocks of chunk_size
+    series are scored in parallel (workers=1 runs in this process).
+    Returns {'models': names, 'scores': models x series MAE, 'best': name per series};
+    series with too little history get the first model.
+    """
+    values = _as_columns(values)
+    models = list(models or MODELS)
+    jobs = [
+        (values[:, start:start + chunk_size], horizon, folds, models)
+        for start in range(0, values.shape[1], chunk_size)
+    ]
+    with span("backtest", series=values.shape[1], models=len(models), chunks=len(jobs)):
+        if workers == 1 or len(jobs) <= 1:
+            blocks = [_backtest_chunk(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                blocks = list(pool.map(_backtest_chunk, jobs))
+    count("backtest.series", values.shape[1])
+
+    scores = np.hstack(blocks) if blocks else np.empty((len(models), 0))
+    best = [models[index] for index in np.argmin(scores, axis=0)]
+    return {'models': models, 'scores': scores, 'best': best}
+
+
+def synthetic_series(months=60, series=5000, seed=0):
+    """Sales histories mixing trend, seasonality and noise, for benchmarks"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(months)[:, None]
+    level = rng.uniform(100, 1000, series)
+    growth = rng.normal(0.01, 0.01, series)
+    season = rng.uniform(0, 0.3, series) * np.sin(2 * np.pi * (t + rng.integers(0, SEASON, series)) / SEASON)
+    noise = rng.normal(0, rng.uniform(0.02, 0.15, series), (months, series))
+    return level * np.exp(growth * t) * (1 + season) * (1 + noise)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest the forecasting models on synthetic series.")
+    parser.add_argument("--series", type=int, default=5000, help="Number of series")
+    parser.add_argument("--months", type=int, default=60, help="History length")
+    parser.add_argument("--horizon", type=int, default=3, help="Months forecast at each origin")
+    parser.add_argument("--folds", type=int, default=3, help="Rolling origins per series")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    values = synthetic_series(args.months, args.series)
+    started = time.perf_counter()
+    result = backtest(values, args.horizon, args.folds, workers=args.workers)
+    elapsed = time.perf_counter() - started
+    print(f"Backtested {len(result['models'])} models on {args.series:,} series "
+          f"in {elapsed:.2f}s ({args.series / elapsed:,.0f} series/s)")
+    for name in result['models']:
+        print(f"  {name:<15} best on {result['best'].count(name):>6,} series")
@@ -0,0 +1,138 @@
+import importlib
+import os
+import sys
+
+
+class LazyModule:
+    def __init__(self, name):
+        """Stand-in for a module that is only imported on first attribute access"""
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute):
+        if attribute in ("_name", "_module"):
+            raise AttributeError(attribute)  # Not initialized yet, e.g. while copying
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    """Return the module if it is already imported, otherwise a LazyModule for it"""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+class HeadlessError(RuntimeError):
+    """Raised when a dialog is needed but no GUI backend is active"""
+
+
+class TkBackend:
+    name = "tk"
+
+    def __init__(self):
+        """Tkinter dialogs, with COM initialized for the Word report backend where it exists"""
+        self.root = None
+
+    def start(self):
+        """Initialize COM (Windows only) and create the hidden Tk root window"""
+        try:
+            import pythoncom
+        except ImportError:
+            pass  # No COM on this platform; reports are written with the docx backend
+        else:
+            pythoncom.CoInitialize()
+        import tkinter as tk
+        self.root = tk.Tk()
+        self.root.withdraw()
+        return self.root
+
+    def module(self, name):
+        return importlib.import_module("tkinter." + name)
+
+
+class _HeadlessDialogs:
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, function):
+        if function.startswith("show"):
+            # Message boxes become console output
+            return lambda title, message, **options: print(f"{title}: {message}", file=sys.stderr)
+        def unavailable(*args, **kwargs):
+            raise HeadlessError(f"{self._name}.{function} needs a GUI; use the command-line options instead")
+        return unavailable
+
+
+class HeadlessBackend:
+    name = "headless"
+
+    def __init__(self):
+        """No GUI and no COM: nothing is imported, dialogs raise HeadlessError"""
+        self.root = None
+
+    def start(self):
+        return None
+
+    def module(self, name):
+        return _HeadlessDialogs(name)
+
+
+BACKENDS = {
+    "tk": TkBackend,
+    "headless": HeadlessBackend,
+}
+
+_active = None
+
+
+def _default_backend():
+    """SFR_UI if set, otherwise tk unless there is clearly no display"""
+    name = os.environ.get("SFR_UI")
+    if name:
+        return name
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+        return "headless"
+    return "tk"
+
+
+def use_backend(name=None):
+    """Select the GUI/COM backend by name (see BACKENDS) and return it"""
+    global _active
+    name = name or _default_backend()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown UI backend {name!r}, expected one of {', '.join(BACKENDS)}")
+    if _active is None or _active.name != name:
+        _active = BACKENDS[name]()
+    return _active
+
+
+def backend():
+    """The active backend, chosen on first use"""
+    return _active or use_backend()
+
+
+def start_gui():
+    """Start the active backend's GUI (and COM) and return its root window, if any"""
+    return backend().start()
+
+
+class _DialogModule:
+    def __init__(self, name):
+        """Proxy for tkinter.<name> that resolves against the backend active at call time"""
+        self._name = name
+
+    def __getattr__(self, function):
+        return getattr(backend().module(self._name), function)
+
+
+# Drop-in replacements for `from tkinter import filedialog, simpledialog, messagebox`
+filedialog = _DialogModule("filedialog")
+simpledialog = _DialogModule("simpledialog")
+messagebox = _DialogModule("messagebox")
@@ -0,0 +1,210 @@
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+# Set SFR_PROFILE to a file name to profile scripts that have no --profile flag
+PROFILE_ENV = "SFR_PROFILE"
+MEMORY_INTERVAL = 0.01  # Seconds between resident-memory samples, doubled whenever the buffer fills
+MEMORY_SAMPLES = 4096  # Memory samples kept; a full buffer drops every other sample
+MAX_SPANS = 100000  # Most recent spans kept for the trace; per-stage totals always cover every span
+
+_NULL_SPAN = contextlib.nullcontext()
+_profiler = None
+
+
+def _rss():
+    """Resident memory of this process in bytes (peak RSS where current RSS is unavailable)"""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Profiler:
+    def __init__(self, memory=True):
+        """Collects timing spans, counters and memory samples for one run, in bounded memory"""
+        self.started = time.perf_counter()
+        self.spans = deque(maxlen=MAX_SPANS)
+        self.stages = {}
+        self.counters = {}
+        self.memory = []
+        self.peak_rss = None
+        self.interval = MEMORY_INTERVAL
+        self._open = {}  # Peak RSS cells of the spans in progress, updated by the sampler
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+        if memory:
+            self._sampler = threading.Thread(target=self._sample_memory, name="sfr-profile-memory", daemon=True)
+            self._sampler.start()
+
+    def _sample_memory(self):
+        while True:
+            sample = (time.perf_counter(), _rss())
+            with self._lock:
+                if len(self.memory) >= MEMORY_SAMPLES:
+                    # Keep the whole run at half the resolution instead of growing without bound
+                    self.memory = self.memory[::2]
+                    self.interval *= 2
+                self.memory.append(sample)
+                rss = sample[1]
+                self.peak_rss = max(self.peak_rss or 0, rss)
+                for cell in self._open.values():
+                    cell[0] = max(cell[0] or 0, rss)
+            if self._stop.wait(self.interval):
+                break
+
+    def stop(self):
+        """Stop memory sampling (with one last sample)"""
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+
+    @contextlib.contextmanager
+    def span(self, name, args):
+        peak = [None]  # Highest memory sample taken while the span is open
+        if self._sampler is not None:
+            with self._lock:
+                self._open[id(peak)] = peak
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            duration_ms = (end - start) * 1000
+            with self._lock:
+                self._open.pop(id(peak), None)
+                self.spans.append((name, start, end, threading.get_ident(), args, peak[0]))
+                stage = self.stages.get(name)
+                if stage is None:
+                    stage = self.stages[name] = {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'peak_rss': None}
+                stage['calls'] += 1
+                stage['total_ms'] += duration_ms
+                stage['max_ms'] = max(stage['max_ms'], duration_ms)
+                if peak[0] is not None:
+                    stage['peak_rss'] = max(stage['peak_rss'] or 0, peak[0])
+
+    def count(self, name, value):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self):
+        """Spans, per-stage totals, counters and memory as a JSON-ready dict"""
+        with self._lock:
+            recorded = sorted(self.spans, key=lambda span: span[1])
+            stages = {name: dict(stage) for name, stage in self.stages.items()}
+            calls = sum(stage['calls'] for stage in stages.values())
+            counters = dict(self.counters)
+        spans = [{
+            'name': name,
+            'start_ms': (start - self.started) * 1000,
+            'duration_ms': (end - start) * 1000,
+            'thread': thread,
+            'peak_rss': peak,
+            'args': args,
+        } for name, start, end, thread, args, peak in recorded]
+        return {
+            'elapsed_ms': (time.perf_counter() - self.started) * 1000,
+            'stages': stages,
+            'counters': counters,
+            'peak_rss': self.peak_rss,
+            'spans_dropped': calls - len(spans),
+            'spans': spans,
+        }
+
+    def chrome_trace(self):
+        """Events in the Chrome trace format (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        events = [
+            {'name': name, 'ph': 'X', 'pid': pid, 'tid': thread,
+             'ts': (start - self.started) * 1e6, 'dur': (end - start) * 1e6, 'args': args}
+            for name, start, end, thread, args, _ in list(self.spans)
+        ]
+        events.extend(
+            {'name': 'memory', 'ph': 'C', 'pid': pid, 'ts': (moment - self.started) * 1e6,
+             'args': {'rss_mb': rss / 2 ** 20}}
+            for moment, rss in list(self.memory)
+        )
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': {'counters': dict(self.counters)}}
+
+    def write(self, path):
+        """Write a Chrome trace if path ends in .trace.json, otherwise the JSON summary"""
+        data = self.chrome_trace() if path.endswith(".trace.json") else self.summary()
+        with open(path, "w") as handle:
+            json.dump(data, handle, indent=1, default=str)
+        return path
+
+
+def enabled():
+    return _profiler is not None
+
+
+def enable(memory=True):
+    """Start collecting; spans and counters are no-ops until this is called"""
+    global _profiler
+    _profiler = Profiler(memory)
+    return _profiler
+
+
+def disable():
+    """Stop collecting and return the profiler with everything recorded so far"""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def span(name, **args):
+    """Time a stage: `with span("read_table", path=path): ...`"""
+    if _profiler is None:
+        return _NULL_SPAN
+    return _profiler.span(name, args)
+
+
+def count(name, value=1):
+    """Add value to a counter such as rows, columns or bytes processed"""
+    if _profiler is not None:
+        _profiler.count(name, value)
+
+
+@contextlib.contextmanager
+def session(path=None, memory=True):
+    """
+    Profile the enclosed block and write the results to path (or $SFR_PROFILE).
+    Without a path nothing is enabled.
+    """
+    path = path or os.environ.get(PROFILE_ENV)
+    if not path:
+        yield None
+        return
+    profiler = enable(memory)
+    try:
+        with profiler.span("run", {'argv': sys.argv[1:]}):
+            yield profiler
+    finally:
+        disable()
+        profiler.write(path)
+        print(f"Profile written to {path}", file=sys.stderr)
+
+
+def add_arguments(parser):
+    """Add --profile to a script's argument parser"""
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Record stage timings, counters and memory to PATH "
+                             "(a .trace.json file opens in chrome://tracing)")
+    return parser
@@ -0,0 +1,152 @@
+import os
+import re
+import sys
+
+from sfr_profile import count, span
+
+# Paragraph alignment values shared by both backends (Word's wdAlignParagraph constants)
+ALIGN_LEFT = 0
+ALIGN_CENTER = 1
+
+
+class ReportBuilder:
+    def __init__(self):
+        """Collect report paragraphs in memory so the document is written in one pass"""
+        self.paragraphs = []
+
+    def add(self, text="", bold=False, size=None, alignment=ALIGN_LEFT):
+        """Append one paragraph; embedded newlines start new paragraphs with the same style"""
+        for line in str(text).replace("\r\n", "\n").split("\n"):
+            self.paragraphs.append({
+                'text': line,
+                'bold': bold,
+                'size': size,
+                'alignment': alignment
+            })
+        return self
+
+    def title(self, text, size=16):
+        """Append a bold, centred title paragraph"""
+        return self.add(text, bold=True, size=size, alignment=ALIGN_CENTER)
+
+    def blank(self):
+        """Append an empty paragraph"""
+        return self.add("")
+
+    @property
+    def text(self):
+        """Plain-text body of the report"""
+        return "\n".join(paragraph['text'] for paragraph in self.paragraphs)
+
+    def save(self, path, backend="auto"):
+        """Write the report to path with the 'word', 'docx' or 'auto' backend"""
+        if backend == "auto":
+            backend = "word" if sys.platform == "win32" and _word_available() else "docx"
+        with span("report.save", backend=backend, paragraphs=len(self.paragraphs)):
+            BACKENDS[backend](self, path)
+        count("report.paragraphs", len(self.paragraphs))
+        count("report.bytes", os.path.getsize(path) if os.path.exists(path) else 0)
+        return path
+
+
+def _word_available():
+    """Check whether the win32com bridge to Word can be imported"""
+    try:
+        import win32com.client  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def save_with_word(report, path):
+    """Write the report through Word COM with a single Content.Text assignment"""
+    import win32com.client as win32
+
+    word = win32.Dispatch("Word.Application")
+    word.Visible = False
+    try:
+        doc = word.Documents.Add()
+        doc.Content.Text = report.text
+
+        # Apply styling only to the paragraphs that differ from the defaults
+        for index, paragraph in enumerate(report.paragraphs, start=1):
+            if paragraph['bold'] or paragraph['size'] or paragraph['alignment'] != ALIGN_LEFT:
+                word_paragraph = doc.Paragraphs(index)
+                word_paragraph.Range.Font.Bold = paragraph['bold']
+                if paragraph['size']:
+                    word_paragraph.Range.Font.Size = paragraph['size']
+                word_paragraph.Alignment = paragraph['alignment']
+
+        doc.SaveAs(path)
+        doc.Close()
+    finally:
+        word.Quit()
+
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+DOCUMENT_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+)
+
+DOCUMENT_TAIL = '<w:sectPr/></w:body></w:document>'
+
+# Characters outside the XML 1.0 Char production (control characters such as \x01) make
+# document.xml unreadable, so they are dropped. Line breaks inside a paragraph (Excel's \x0b
+# within a cell, \n or \r) become <w:br/> line breaks in the run.
+INVALID_XML_CHARS = re.compile('[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]')
+LINE_BREAKS = re.compile('\r\n|[\r\n\x0b]')
+DOCX_LINE_BREAK = '</w:t><w:br/><w:t xml:space="preserve">'
+
+
+def _docx_paragraph(paragraph):
+    """Render one paragraph as WordprocessingML"""
+    paragraph_props = '<w:pPr><w:jc w:val="center"/></w:pPr>' if paragraph['alignment'] == ALIGN_CENTER else ''
+    run_props = ''
+    if paragraph['bold']:
+        run_props += '<w:b/>'
+    if paragraph['size']:
+        run_props += f'<w:sz w:val="{int(paragraph["size"] * 2)}"/>'
+    if run_props:
+        run_props = f'<w:rPr>{run_props}</w:rPr>'
+    text = LINE_BREAKS.sub('\n', paragraph['text'])
+    text = INVALID_XML_CHARS.sub('', text)
+    # Same escaping as xml.sax.saxutils.escape, without importing it at startup
+    text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    text = text.replace('\n', DOCX_LINE_BREAK)
+    return f'<w:p>{paragraph_props}<w:r>{run_props}<w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+
+
+def save_docx(report, path):
+    """Write the report as a .docx package using only the standard library"""
+    import zipfile
+
+    body = "".join(_docx_paragraph(paragraph) for paragraph in report.paragraphs)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", CONTENT_TYPES)
+        package.writestr("_rels/.rels", PACKAGE_RELS)
+        package.writestr("word/document.xml", DOCUMENT_HEAD + body + DOCUMENT_TAIL)
+
+
+BACKENDS = {
+    'word': save_with_word,
+    'docx': save_docx,
+}
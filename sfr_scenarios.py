@@ -0,0 +1,81 @@
+import numpy as np
+
+DEFAULT_QUANTILES = (10, 50, 90)
+DEFAULT_SCENARIOS = 10000
+MAX_CHUNK_BYTES = 256 * 1024 * 1024
+
+
+def fit_growth(history):
+    """
+    Mean growth (%) and volatility (standard deviation of log growth, %) of a monthly
+    sales history. Non-positive and missing months are skipped.
+    """
+    values = np.asarray(history, dtype=float)
+    values = values[np.isfinite(values) & (values > 0)]
+    if len(values) < 3:
+        raise ValueError("At least three positive months are needed to fit growth")
+    log_growth = np.diff(np.log(values))
+    return float(np.expm1(log_growth.mean()) * 100), float(log_growth.std(ddof=1) * 100)
+
+
+def _check_shape(months, scenarios):
+    if months < 1:
+        raise ValueError("months must be at least 1")
+    if scenarios < 1:
+        raise ValueError("scenarios must be at least 1")
+
+
+def simulate_paths(current_units, growth_rates, volatilities, months, scenarios, rng):
+    """
+    Sales paths as one products x scenarios x months tensor. Month 0 is the current
+    level; every later month applies a log-normal growth step whose median is the
+    product's growth rate, so the median path is the deterministic forecast.
+    """
+    _check_shape(months, scenarios)
+    current_units = np.asarray(current_units, dtype=float)
+    drift = np.log1p(np.asarray(growth_rates, dtype=float) / 100)
+    spread = np.asarray(volatilities, dtype=float) / 100
+
+    steps = rng.standard_normal((len(current_units), scenarios, months - 1))
+    steps *= spread[:, None, None]
+    steps += drift[:, None, None]
+    paths = np.empty((len(current_units), scenarios, months))
+    paths[:, :, 0] = 0.0
+    np.cumsum(steps, axis=2, out=paths[:, :, 1:])
+    np.exp(paths, out=paths)
+    paths *= current_units[:, None, None]
+    return paths
+
+
+def scenario_bands(current_units, growth_rates, volatilities, months=12, scenarios=DEFAULT_SCENARIOS,
+                   quantiles=DEFAULT_QUANTILES, seed=None, max_bytes=MAX_CHUNK_BYTES):
+    """
+    Monte Carlo quantile bands for several products at once.
+    Products are simulated in chunks so each path tensor stays under max_bytes
+    (one product is the smallest chunk). Returns a dict with
+      'quantiles' - the percentiles computed
+      'monthly'   - array products x quantiles x months
+      'total'     - array products x quantiles of the summed forecast
+    """
+    _check_shape(months, scenarios)
+    current_units = np.atleast_1d(np.asarray(current_units, dtype=float))
+    products = len(current_units)
+    growth_rates = np.broadcast_to(np.asarray(growth_rates, dtype=float), (products,))
+    volatilities = np.broadcast_to(np.asarray(volatilities, dtype=float), (products,))
+    rng = np.random.default_rng(seed)
+
+    monthly = np.empty((products, len(quantiles), months))
+    total = np.empty((products, len(quantiles)))
+    # The path tensor and the step tensor are alive together; the percentiles then work in
+    # place on the paths (overwrite_input), so no third copy is made
+    chunk = max(1, max_bytes // (2 * scenarios * months * 8))
+    for start in range(0, products, chunk):
+        stop = min(start + chunk, products)
+        paths = simulate_paths(current_units[start:stop], growth_rates[start:stop],
+                               volatilities[start:stop], months, scenarios, rng)
+        totals = paths.sum(axis=2)
+        total[start:stop] = np.percentile(totals, quantiles, axis=1, overwrite_input=True).T
+        monthly[start:stop] = np.percentile(paths, quantiles, axis=1, overwrite_input=True).transpose(1, 0, 2)
+        del paths, totals
+
+    return {'quantiles': tuple(quantiles), 'monthly': monthly, 'total': total}
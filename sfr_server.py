@@ -0,0 +1,395 @@
+import argparse
+import asyncio
+import importlib.util
+import json
+import math
+import multiprocessing
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from sfr_ingest import read_table
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RANGE_SCRIPT = os.path.join(HERE, "SFR v1.4.py")
+
+MAX_BODY = 1 << 20  # Largest accepted request body in bytes
+LATENCY_WINDOW = 1000  # Recent requests kept per endpoint for the latency percentiles
+
+_range_module = None
+
+
+def range_module():
+    """The SFR v1.4 script (RowColumnAnalyzer, RangeQueryIndex, ...), loaded once per process"""
+    global _range_module
+    if _range_module is None:
+        spec = importlib.util.spec_from_file_location("sfr_range_analysis", RANGE_SCRIPT)
+        _range_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_range_module)
+    return _range_module
+
+
+# Process pool workers
+
+def _parse_workbook(path):
+    """Worker: parse the first sheet of a workbook"""
+    return read_table(path, sheet_name=0)
+
+
+def _render_report(job):
+    """Worker: render and save one range report from an analysis computed by the server"""
+    return range_module()._render_report(job)
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        """An error answered with `status` and a JSON body {"error": message}"""
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+
+
+def _json_value(value):
+    """Cell value as JSON: numpy scalars become Python numbers, NaN becomes null"""
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+class WorkbookCache:
+    def __init__(self, max_bytes):
+        """Parsed workbooks and their range indexes, evicted least recently used first by memory"""
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # (path, mtime, size) -> (index, bytes)
+        self.loading = {}  # Key -> future shared by concurrent requests for the same workbook
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _footprint(index):
+        return int(index.df.memory_usage(deep=True).sum()) + index.nbytes()
+
+    async def get(self, path, pool):
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+        if key in self.loading:
+            self.hits += 1
+            return await asyncio.shield(self.loading[key])
+
+        self.misses += 1
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.loading[key] = future
+        try:
+            df = await loop.run_in_executor(pool, _parse_workbook, path)
+            index = await asyncio.to_thread(range_module().RangeQueryIndex, df)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Waiters re-raise it; mark it retrieved for the loop
+            raise
+        finally:
+            del self.loading[key]
+        future.set_result(index)
+        self._store(key, index)
+        return index
+
+    def _store(self, key, index):
+        size = self._footprint(index)
+        # Older versions of a changed workbook are dropped right away
+        for stale in [old for old in self.entries if old[0] == key[0]]:
+            self._evict(stale)
+        self.entries[key] = (index, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            self._evict(next(iter(self.entries)))
+            self.evictions += 1
+
+    def _evict(self, key):
+        _, size = self.entries.pop(key)
+        self.bytes -= size
+
+    def stats(self):
+        return {'workbooks': len(self.entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+class LatencyMetrics:
+    def __init__(self):
+        """Request counts, errors and recent latencies per endpoint"""
+        self.endpoints = {}
+
+    def record(self, endpoint, status, seconds):
+        entry = self.endpoints.setdefault(endpoint, {'requests': 0, 'errors': 0, 'rejected': 0,
+                                                     'latencies': deque(maxlen=LATENCY_WINDOW)})
+        entry['requests'] += 1
+        if status in (429, 503):
+            entry['rejected'] += 1
+        elif status >= 400:
+            entry['errors'] += 1
+        entry['latencies'].append(seconds)
+
+    def summary(self):
+        result = {}
+        for endpoint, entry in self.endpoints.items():
+            latencies = sorted(entry['latencies'])
+            def percentile(p):
+                return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000 if latencies else None
+            result[endpoint] = {
+                'requests': entry['requests'], 'errors': entry['errors'], 'rejected': entry['rejected'],
+                'p50_ms': percentile(50), 'p95_ms': percentile(95), 'p99_ms': percentile(99),
+                'max_ms': latencies[-1] * 1000 if latencies else None,
+            }
+        return result
+
+
+class ReportServer:
+    def __init__(self, root, output_dir="reports", workers=None, cache_bytes=512 * 1024 * 1024,
+                 max_pending=64, max_per_tenant=8):
+        """
+        HTTP/JSON front end for the range analyses. Workbooks are resolved under root,
+        parsing and report rendering run on a process pool, and requests beyond
+        max_pending in flight (or max_per_tenant for one X-Tenant) are rejected
+        instead of queued without bound.
+        """
+        self.root = os.path.realpath(root)
+        self.output_dir = os.path.realpath(output_dir)
+        # Workers must not be forked: they start lazily while clients are connected and would
+        # inherit those sockets, holding the connections open after the server closes them
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+        self.cache = WorkbookCache(cache_bytes)
+        self.metrics = LatencyMetrics()
+        self.max_pending = max_pending
+        self.max_per_tenant = max_per_tenant
+        self.pending = 0
+        self.tenants = {}
+        self.started = time.monotonic()
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/metrics'): self.metrics_view,
+            ('POST', '/analyze'): self.analyze,
+            ('POST', '/summary'): self.summary,
+            ('POST', '/report'): self.report,
+        }
+
+    # Endpoints
+
+    async def health(self, request):
+        return {'status': 'ok', 'uptime_s': time.monotonic() - self.started}
+
+    async def metrics_view(self, request):
+        return {'pending': self.pending, 'max_pending': self.max_pending,
+                'tenants': dict(self.tenants), 'cache': self.cache.stats(),
+                'endpoints': self.metrics.summary()}
+
+    async def _analyzer(self, request):
+        """RowColumnAnalyzer for the request's workbook, row and column range"""
+        index = await self.cache.get(self._workbook_path(request), self.pool)
+        # Checked like /summary: unknown or out-of-range columns are a 400, not empty cells
+        start_col = index.column_number(request.get('start_column', 1))
+        end_col = index.column_number(request.get('end_column') or len(index.df.columns))
+        return range_module().RowColumnAnalyzer(
+            request['workbook'], int(request['row']), start_col, end_col, request.get('company', ''), index=index
+        )
+
+    async def analyze(self, request):
+        analyzer = await self._analyzer(request)
+        analysis = analyzer.analyze_range()
+        numeric = analysis['numeric_data']
+        return {
+            'workbook': request['workbook'],
+            'row': analyzer.row_number + 1,
+            'cells': {str(column): _json_value(value) for column, value in analysis['row_data'].items()},
+            'numeric': {
+                'count': len(numeric),
+                'sum': _json_value(numeric.sum()) if len(numeric) else None,
+                'mean': _json_value(numeric.mean()) if len(numeric) else None,
+                'max': _json_value(numeric.max()) if len(numeric) else None,
+                'min': _json_value(numeric.min()) if len(numeric) else None,
+            },
+        }
+
+    async def summary(self, request):
+        index = await self.cache.get(self._workbook_path(request), self.pool)
+        module = range_module()
+        start_col = index.column_number(request.get('start_column', 1))
+        end_col = index.column_number(request.get('end_column') or len(index.df.columns))
+        table = await asyncio.to_thread(module.summarize_range, index.df, start_col, end_col,
+                                        int(request.get('start_row', 1)), request.get('end_row'))
+        return {
+            'workbook': request['workbook'],
+            'columns': list(table.columns),
+            'rows': {str(row): [_json_value(value) for value in values]
+                     for row, values in zip(table.index, table.to_numpy())},
+        }
+
+    async def report(self, request):
+        analyzer = await self._analyzer(request)
+        analysis = analyzer.analyze_range()
+        os.makedirs(self.output_dir, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(request['workbook']))[0]
+        save_path = os.path.join(self.output_dir, f"{stem}_row{analyzer.row_number + 1}_{uuid.uuid4().hex[:8]}.docx")
+        job = (save_path, analyzer.company_name, analyzer.row_number + 1,
+               analyzer.start_column, analyzer.end_column, analysis)
+        path = await asyncio.get_running_loop().run_in_executor(self.pool, _render_report, job)
+        return {'report': path}
+
+    def _workbook_path(self, request):
+        """Resolve the request's workbook under the server root"""
+        if not isinstance(request.get('workbook'), str):
+            raise HTTPError(400, "Field 'workbook' (a path under the server root) is required")
+        path = os.path.realpath(os.path.join(self.root, request['workbook']))
+        if os.path.commonpath([path, self.root]) != self.root:
+            raise HTTPError(400, "Workbook must be inside the server root")
+        if not os.path.isfile(path):
+            raise HTTPError(404, f"No workbook {request['workbook']}")
+        return path
+
+    # HTTP
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HTTPError(400, "Malformed Content-Length")
+        if length > MAX_BODY:
+            raise HTTPError(413, f"Request body over {MAX_BODY} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method, target.split("?", 1)[0], headers, body
+
+    async def _respond(self, writer, status, payload, headers=None):
+        body = json.dumps(payload, default=str).encode()
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", "Content-Type: application/json",
+                 f"Content-Length: {len(body)}", "Connection: close"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+
+    async def _dispatch(self, method, path, headers, body):
+        handler = self.routes.get((method, path))
+        if handler is None:
+            known = [route_method for route_method, route_path in self.routes if route_path == path]
+            raise HTTPError(405 if known else 404, f"No route {method} {path}")
+        if method == "GET":
+            return await handler({})
+
+        # Backpressure: reject rather than queue once the server or the tenant is saturated
+        tenant = headers.get("x-tenant", "default")
+        if self.pending >= self.max_pending:
+            raise HTTPError(503, "Server busy", {"Retry-After": "1"})
+        if self.tenants.get(tenant, 0) >= self.max_per_tenant:
+            raise HTTPError(429, f"Too many requests in flight for tenant {tenant}", {"Retry-After": "1"})
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Body must be JSON")
+        if not isinstance(request, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+
+        self.pending += 1
+        self.tenants[tenant] = self.tenants.get(tenant, 0) + 1
+        try:
+            return await handler(request)
+        except KeyError as e:
+            raise HTTPError(400, f"Missing field {e}")
+        except (TypeError, ValueError) as e:
+            raise HTTPError(400, str(e))  # Bad row, column or range in the request
+        finally:
+            self.pending -= 1
+            self.tenants[tenant] -= 1
+            if not self.tenants[tenant]:
+                del self.tenants[tenant]
+
+    async def handle(self, reader, writer):
+        started = time.perf_counter()
+        endpoint = "invalid"
+        status, payload, headers = 200, None, None
+        try:
+            request = await self._read_request(reader)
+            if request is None:
+                return
+            method, path, request_headers, body = request
+            endpoint = path
+            payload = await self._dispatch(method, path, request_headers, body)
+        except HTTPError as e:
+            status, payload, headers = e.status, {'error': str(e)}, e.headers
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        except Exception as e:
+            status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+        try:
+            await self._respond(writer, status, payload, headers)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            self.metrics.record(endpoint, status, time.perf_counter() - started)
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Serving range analyses for {self.root} on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP/JSON server for SFR range analyses and reports.")
+    parser.add_argument("--root", default=".", help="Directory the requested workbooks are resolved under")
+    parser.add_argument("--output-dir", default="reports", help="Directory reports are written to")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--workers", type=int, help="Parsing/rendering processes (default: CPU count)")
+    parser.add_argument("--cache-mb", type=int, default=512, help="Memory for cached workbooks (MB)")
+    parser.add_argument("--max-pending", type=int, default=64, help="Requests in flight before answering 503")
+    parser.add_argument("--max-per-tenant", type=int, default=8,
+                        help="Requests in flight per X-Tenant before answering 429")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    server = ReportServer(args.root, args.output_dir, args.workers, args.cache_mb * 1024 * 1024,
+                          args.max_pending, args.max_per_tenant)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
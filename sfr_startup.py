@@ -0,0 +1,141 @@
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE = os.path.join(HERE, "startup_history.jsonl")  # Local results, not tracked by git
+
+# Modules a plain start of the command-line tools should not pay for
+HEAVY_MODULES = ("pandas", "numpy", "scipy", "tkinter", "pythoncom", "win32com", "pyarrow", "matplotlib")
+
+# Loads a script under a name other than __main__, so only its imports run, then parses an
+# empty command line with its parse_args (if it has one), which may import more on its own
+LOADER = (
+    "import importlib.util, sys; "
+    "spec = importlib.util.spec_from_file_location('sfr_startup_target', sys.argv[1]); "
+    "module = importlib.util.module_from_spec(spec); spec.loader.exec_module(module); "
+    "getattr(module, 'parse_args', lambda argv: None)([])"
+)
+
+
+def parse_importtime(stderr):
+    """
+    Parse `python -X importtime` output into [(module, self_us, cumulative_us, depth)],
+    in the order the imports finished
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def measure(script, runs=5):
+    """Median wall time and the import profile of loading script and parsing its arguments in a fresh interpreter"""
+    walls = []
+    imports = []
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [HERE, os.environ.get("PYTHONPATH")])))
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", LOADER, script],
+                                capture_output=True, text=True, env=env)
+        walls.append(time.perf_counter() - started)
+        if result.returncode != 0:
+            raise RuntimeError(f"{os.path.basename(script)} failed to import:\n{result.stderr.strip().splitlines()[-1]}")
+        imports = parse_importtime(result.stderr)
+
+    top_level = [entry for entry in imports if entry[3] == 1]
+    imported = {name.split(".")[0] for name, _, _, _ in imports}
+    return {
+        'wall_ms': statistics.median(walls) * 1000,
+        'imports_ms': sum(cumulative for _, _, cumulative, _ in top_level) / 1000,
+        'modules': len(imports),
+        'heavy': sorted(imported.intersection(HEAVY_MODULES)),
+        'slowest': [(name, cumulative / 1000) for name, _, cumulative, _
+                    in sorted(top_level, key=lambda entry: -entry[2])[:5]],
+    }
+
+
+def measure_baseline(runs=5):
+    """Median wall time of starting an empty interpreter, for reference"""
+    walls = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        walls.append(time.perf_counter() - started)
+    return statistics.median(walls) * 1000
+
+
+def release_label():
+    """Current git revision, or 'unknown' outside a checkout"""
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_history(path=HISTORY_FILE):
+    """Previous benchmark records, oldest first"""
+    if not os.path.exists(path):
+        return []
+    with open(path) as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def benchmark(scripts=None, runs=5, release=None, history=HISTORY_FILE):
+    """
+    Measure the startup of each script, print it next to the last recorded run and
+    append the results to the history file so startup can be tracked over releases
+    """
+    scripts = scripts or sorted(glob.glob(os.path.join(HERE, "SFR v*.py")))
+    release = release or release_label()
+    previous = {}
+    for record in load_history(history) if history else []:
+        previous[record['script']] = record
+
+    baseline = measure_baseline(runs)
+    print(f"Release {release}, interpreter start {baseline:.1f} ms\n")
+    records = []
+    for script in scripts:
+        name = os.path.basename(script)
+        result = measure(script, runs)
+        last = previous.get(name)
+        change = f" ({result['wall_ms'] - last['wall_ms']:+.1f} ms vs {last['release']})" if last else ""
+        print(f"{name}: {result['wall_ms']:.1f} ms wall, {result['imports_ms']:.1f} ms in imports, "
+              f"{result['modules']} modules{change}")
+        print(f"  heavy modules at startup: {', '.join(result['heavy']) or 'none'}")
+        for module, milliseconds in result['slowest']:
+            print(f"  {milliseconds:8.1f} ms  {module}")
+        records.append(dict(result, script=name, release=release, baseline_ms=baseline,
+                            python=sys.version.split()[0], time=datetime.now().isoformat(timespec='seconds')))
+
+    if history:
+        with open(history, "a") as handle:
+            for record in records:
+                handle.write(json.dumps(record) + "\n")
+    return records
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Startup time benchmark for the SFR scripts.")
+    parser.add_argument("scripts", nargs="*", help="Scripts to measure (default: every SFR v*.py)")
+    parser.add_argument("--runs", type=int, default=5, help="Interpreter starts per script (median is reported)")
+    parser.add_argument("--release", help="Label for this run in the history (default: git describe)")
+    parser.add_argument("--history", default=HISTORY_FILE, help="JSON lines file the results are appended to")
+    parser.add_argument("--no-history", action="store_true", help="Do not read or write the history file")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    benchmark(args.scripts, args.runs, args.release, None if args.no_history else args.history)